@@ -0,0 +1,51 @@
+"""Compare the ways CBVTestCase can build a request for a view call.
+
+Times building a request with a fresh RequestFactory (what CBVTestCase did
+before factories were pooled), with the pooled factory, and by cloning a
+RequestTemplate.
+
+Usage: python scripts/bench_cbv_requests.py [number]
+"""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+import timeit
+
+import django
+from django.conf import settings
+
+# Run from a checkout without installing the package.
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+settings.configure()
+django.setup()
+
+from django.test import RequestFactory
+
+from test_plus.test import CBVTestCase
+
+DATA = {"name": "revsys", "page": "2", "tags": ["a", "b", "c"]}
+
+
+def main(number: int) -> None:
+    factory = CBVTestCase.get_request_factory()
+    get_template = CBVTestCase.request_template("get", "/")
+    post_template = CBVTestCase.request_template("post", "/")
+
+    cases = {
+        "GET  new factory": lambda: RequestFactory().get("/", DATA),
+        "GET  pooled factory": lambda: factory.get("/", DATA),
+        "GET  template": lambda: get_template.build(data=DATA),
+        "POST new factory": lambda: RequestFactory().post("/", DATA),
+        "POST pooled factory": lambda: factory.post("/", DATA),
+        "POST template": lambda: post_template.build(data=DATA),
+    }
+    for name, func in cases.items():
+        seconds = min(timeit.repeat(func, number=number, repeat=5))
+        print(f"{name:<20} {seconds / number * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
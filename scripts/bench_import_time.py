@@ -0,0 +1,50 @@
+"""Measure what importing test_plus costs, using python -X importtime.
+
+Each module is imported in a fresh interpreter after pytest, so the
+plugin's time is what test_plus adds to every pytest process, on top of
+pytest itself. The best of several runs is reported, along with the
+Django and test_plus modules each import loaded.
+
+Usage: python scripts/bench_import_time.py [runs]
+"""
+
+from __future__ import annotations
+
+import pathlib
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+MODULES = ["test_plus", "test_plus.plugin", "test_plus.test"]
+
+
+def import_time(module: str) -> tuple[float, list[str]]:
+    """Return the cumulative import time of `module` in ms and the modules it imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import pytest; import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lines = [line for line in result.stderr.splitlines() if line.startswith("import time:")]
+    # Lines after pytest's own are the ones importing `module` loaded
+    names = [line.rsplit("|", 1)[1].strip() for line in lines]
+    loaded = names[names.index("pytest") + 1 :]
+    cumulative = int(lines[-1].split("|")[1])
+    return cumulative / 1000, loaded
+
+
+def main(runs: int) -> None:
+    for module in MODULES:
+        results = [import_time(module) for _ in range(runs)]
+        best = min(ms for ms, _ in results)
+        loaded = results[0][1]
+        django = sum(name.startswith("django") for name in loaded)
+        ours = [name for name in loaded if name.startswith("test_plus")]
+        print(f"{module:<18} {best:8.1f} ms  {django:4d} django modules  {', '.join(ours)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
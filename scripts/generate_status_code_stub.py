@@ -0,0 +1,52 @@
+"""Regenerate test_plus/status_codes.pyi from the status code table.
+
+The stub is rendered from the methods on StatusCodeAssertionMixin, in the
+order status_codes.py generates them.
+
+Usage: python scripts/generate_status_code_stub.py
+"""
+
+import inspect
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+# Run from a checkout without installing the package.
+sys.path.insert(0, str(ROOT))
+
+from test_plus.status_codes import StatusCodeAssertionMixin
+
+STUB_PATH = ROOT / "test_plus" / "status_codes.pyi"
+
+
+def render_stub() -> str:
+    lines = [
+        "# Generated from _STATUS_CODES by scripts/generate_status_code_stub.py. Do not edit.",
+        "from collections.abc import Iterable, Mapping",
+        "from typing import Any",
+        "",
+        "class StatusCodeAssertionMixin:",
+        "    def assertStatusCodes(",
+        "        self,",
+        "        responses: Iterable[Any] | Mapping[str, Any],",
+        "        status_code: int | Mapping[str, int] = 200,",
+        "        msg: str | None = None,",
+        "    ) -> None: ...",
+    ]
+    for name, method in vars(StatusCodeAssertionMixin).items():
+        if not name.startswith(("assert_http_", "response_")):
+            continue
+        url = ", url: str | None = None" if "url" in inspect.signature(method).parameters else ""
+        params = f"self, response: Any = None, msg: str | None = None{url}"
+        signature = f"    def {name}({params}) -> None:"
+        if len(signature) > 120:
+            signature = f"    def {name}(\n        {params}\n    ) -> None:"
+        lines.append(signature)
+        lines.append(f'        """{method.__doc__}"""')
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    STUB_PATH.write_text(render_stub())
+    print(f"Wrote {STUB_PATH}")
@@ -1,6 +1,26 @@
-from .test import APITestCase, TestCase
+import importlib
 
 __all__ = [
     "APITestCase",
     "TestCase",
+    "TransactionTestCase",
 ]
+
+# Submodules importing the package used to load, still reachable as attributes
+_SUBMODULES = ("compat", "status_codes", "test")
+
+
+def __getattr__(name):
+    # Loaded on first use, so that importing the package, as the pytest
+    # plugin does in every pytest process, does not import Django.
+    if name in __all__:
+        from . import test
+
+        return getattr(test, name)
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *__all__, *_SUBMODULES})
@@ -0,0 +1,83 @@
+"""
+Query count baselines: how many queries each assertNumQueriesLessThan() and
+assertGoodView() block made, keyed by test id and the URL names the block
+requested. A block that makes more than its baseline fails.
+
+The pytest plugin checks them with ``--tp-query-baselines`` and rewrites the
+file with ``--tp-update-query-baselines``.
+"""
+
+from .lockfile import Lockfile
+
+DEFAULT_BASELINES_PATH = "query_baselines.json"
+BASELINES_VERSION = 1
+
+
+class QueryBaselines:
+    """Compares query counts against stored baselines and collects the counts of this run."""
+
+    def __init__(self):
+        self.enabled = False
+        self.update = False
+        self.current = None
+        self.stored = {}
+        self.recorded = {}
+        self.requested = []
+
+    def start_test(self, test_id):
+        self.current = test_id
+        self.recorded.pop(test_id, None)
+        self.requested = []
+
+    def record_request(self, url_name):
+        if self.enabled:
+            self.requested.append(str(url_name))
+
+    def key(self, test_id, start):
+        """
+        Name the block that began when `start` URLs had been requested, after
+        the URL names requested in it. Repeated names get a ``#2`` suffix.
+        """
+        names = list(dict.fromkeys(self.requested[start:]))
+        base = ",".join(names) or "block"
+        entries = self.recorded.get(test_id, {})
+        key, n = base, 1
+        while key in entries:
+            n += 1
+            key = f"{base} #{n}"
+        return key
+
+    def check(self, test_id, start, queries, db_time):
+        """
+        Record the count and database time of a block and return an error
+        message if it made more queries than its baseline, or None.
+        """
+        key = self.key(test_id, start)
+        self.recorded.setdefault(test_id, {})[key] = {"queries": queries, "db_time_ms": round(db_time * 1000, 3)}
+        baseline = self.stored.get(test_id, {}).get(key)
+        if self.update or baseline is None or queries <= baseline["queries"]:
+            return None
+        return (
+            f"{queries} queries executed for {key!r}, more than the baseline of {baseline['queries']}. "
+            "Run pytest with --tp-update-query-baselines if the increase is expected."
+        )
+
+    def merged(self, recorded):
+        """
+        Return the stored baselines updated with `recorded`.
+
+        When updating, each recorded test's entries replace its stored ones.
+        Otherwise only entries missing from the file are added.
+        """
+        merged = {test_id: dict(entries) for test_id, entries in self.stored.items()}
+        for test_id, entries in recorded.items():
+            if self.update:
+                merged[test_id] = dict(entries)
+            else:
+                for key, entry in entries.items():
+                    merged.setdefault(test_id, {}).setdefault(key, entry)
+        return merged
+
+
+baselines = QueryBaselines()
+baselines_file = Lockfile(BASELINES_VERSION)
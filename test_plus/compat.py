@@ -1,26 +1,53 @@
+import importlib.util
+from functools import cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.dispatch import receiver
 from django.test import TestCase as DjangoTestCase
+from django.test.signals import setting_changed
 
 # Re-exported for convenience so callers can import them from test_plus.compat.
 from django.urls import NoReverseMatch, reverse  # noqa: F401
+from django.utils.module_loading import import_string
 
-try:
-    import rest_framework  # noqa
 
-    DRF = True
-except ImportError:
-    DRF = False
+def __getattr__(name):
+    # Whether DRF is installed, looked up on first use rather than on import
+    if name == "DRF":
+        global DRF
+        DRF = importlib.util.find_spec("rest_framework") is not None
+        return DRF
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
+def _missing_api_client(*args, **kwargs):
+    raise ImproperlyConfigured("django-rest-framework must be installed in order to use APITestCase.")
 
+
+@cache
 def get_api_client():
+    """
+    Return the client class for APITestCase and the api_client fixture.
+
+    That is the class named by the TEST_PLUS_API_CLIENT setting if there is
+    one, otherwise DRF's APIClient. The lookup happens once, and again only
+    when the setting is overridden.
+    """
+    client_path = getattr(settings, "TEST_PLUS_API_CLIENT", None)
+    if client_path:
+        return import_string(client_path)
     try:
         from rest_framework.test import APIClient
     except ImportError:
-        from django.core.exceptions import ImproperlyConfigured
+        return _missing_api_client
+    return APIClient
 
-        def APIClient(*args, **kwargs):
-            raise ImproperlyConfigured("django-rest-framework must be installed in order to use APITestCase.")
 
-    return APIClient
+@receiver(setting_changed)
+def _clear_api_client(setting, **kwargs):
+    if setting == "TEST_PLUS_API_CLIENT":
+        get_api_client.cache_clear()
 
 
 assertURLEqual = DjangoTestCase.assertURLEqual
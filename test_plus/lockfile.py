@@ -0,0 +1,38 @@
+"""
+Read and write the versioned JSON files the pytest plugin keeps between runs,
+and merge the partial files pytest-xdist workers leave next to them.
+"""
+
+import json
+from pathlib import Path
+
+
+class Lockfile:
+    """A JSON file holding a ``tests`` section and the format ``version`` it was written with."""
+
+    def __init__(self, version):
+        self.version = version
+
+    def load(self, path):
+        """Load the tests section of `path`, or an empty one if there is none or it has another version."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        if data.get("version") != self.version:
+            return {}
+        return data["tests"]
+
+    def write(self, path, tests):
+        with open(path, "w") as f:
+            json.dump({"version": self.version, "tests": tests}, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    def merge_workers(self, path):
+        """Collect and remove the partial files left by pytest-xdist workers next to `path`."""
+        tests = {}
+        for worker_path in sorted(Path(path).parent.glob(f"{Path(path).name}.gw*")):
+            tests.update(self.load(worker_path))
+            worker_path.unlink()
+        return tests
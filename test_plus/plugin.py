@@ -1,35 +1,238 @@
+"""
+The pytest plugin, loaded in every pytest process through the pytest11 entry
+point. Django and test_plus.test are only imported once a fixture needs
+them, so projects that do not use test_plus pay next to nothing for it.
+"""
+
+import os
+import warnings
+from fnmatch import fnmatchcase
+from functools import cache
+
 import pytest
 
-from .compat import get_api_client
-from .test import TestCase as BaseTestCase
+from . import baselines, profile_files, selection
 
 
-class TestCase(BaseTestCase):
-    """
-    pytest plugin version of test_plus.TestCase with helpful additional features
-    """
+@cache
+def _test_case_class():
+    from .test import TestCase as BaseTestCase
+
+    class TestCase(BaseTestCase):
+        """
+        pytest plugin version of test_plus.TestCase with helpful additional features
+        """
+
+        user_factory = None
 
-    user_factory = None
+        def __init__(self, *args, **kwargs):
+            self.last_response = None
+            super().__init__(*args, **kwargs)
 
-    def __init__(self, *args, **kwargs):
-        self.last_response = None
-        super().__init__(*args, **kwargs)
+    return TestCase
+
+
+def __getattr__(name):
+    if name == "TestCase":
+        return _test_case_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _test_case(client):
+    from .test import _login_sessions, _payloads
+
+    TestCase = _test_case_class()
+    t = TestCase()
+    t.client = client
+    yield t
+    t._release_responses()
+    # The fixture's class lives for the whole session, so forget what the
+    # test stored on it: cache_login() sessions do not outlive the test's
+    # database state, and json_payload() names belong to the test.
+    _login_sessions.pop(TestCase, None)
+    _payloads.pop(TestCase, None)
 
 
 @pytest.fixture
 def api_client():
+    from .compat import get_api_client
+
     return get_api_client()()
 
 
 @pytest.fixture
 def tp(client):
-    t = TestCase()
-    t.client = client
-    return t
+    yield from _test_case(client)
 
 
 @pytest.fixture
 def tp_api(api_client):
-    t = TestCase()
-    t.client = api_client
-    return t
+    yield from _test_case(api_client)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("test_plus")
+    group.addoption(
+        "--tp-record-deps",
+        action="store_true",
+        help="Record the URLs, views and templates each test touches in the dependency map.",
+    )
+    group.addoption(
+        "--tp-changed",
+        metavar="REF",
+        help="Only run tests whose views, templates or test file changed since git REF, per the dependency map.",
+    )
+    group.addoption(
+        "--tp-deps-map",
+        metavar="PATH",
+        default=selection.DEFAULT_MAP_PATH,
+        help=f"Dependency map file, relative to the rootdir (default: {selection.DEFAULT_MAP_PATH}).",
+    )
+    group.addoption(
+        "--tp-query-baselines",
+        action="store_true",
+        help="Fail assertNumQueriesLessThan() and assertGoodView() calls that make more queries than their baseline.",
+    )
+    group.addoption(
+        "--tp-update-query-baselines",
+        action="store_true",
+        help="Rewrite the query baselines of the tests that run with their current counts.",
+    )
+    group.addoption(
+        "--tp-query-baselines-file",
+        metavar="PATH",
+        default=baselines.DEFAULT_BASELINES_PATH,
+        help=f"Query baselines file, relative to the rootdir (default: {baselines.DEFAULT_BASELINES_PATH}).",
+    )
+    group.addoption(
+        "--tp-profile",
+        metavar="PATTERN",
+        help="Profile every request made by tests whose id matches the glob PATTERN or contains it.",
+    )
+    group.addoption(
+        "--tp-profiler",
+        choices=profile_files.PROFILERS,
+        default="cprofile",
+        help="Profiler for --tp-profile: cprofile writes .prof files, pyinstrument collapsed stacks (default: cprofile).",
+    )
+    group.addoption(
+        "--tp-profile-dir",
+        metavar="PATH",
+        default=profile_files.DEFAULT_PROFILE_DIR,
+        help=f"Directory for profile files, relative to the rootdir (default: {profile_files.DEFAULT_PROFILE_DIR}).",
+    )
+
+
+def _deps_map_path(config):
+    return os.path.join(config.rootpath, config.getoption("tp_deps_map"))
+
+
+def _baselines_path(config):
+    return os.path.join(config.rootpath, config.getoption("tp_query_baselines_file"))
+
+
+def pytest_configure(config):
+    if config.getoption("tp_record_deps"):
+        selection.recorder.enabled = True
+    if config.getoption("tp_query_baselines") or config.getoption("tp_update_query_baselines"):
+        baselines.baselines.enabled = True
+        baselines.baselines.update = config.getoption("tp_update_query_baselines")
+        baselines.baselines.stored = baselines.baselines_file.load(_baselines_path(config))
+    profile_files.dumper.directory = os.path.join(config.rootpath, config.getoption("tp_profile_dir"))
+
+
+def pytest_collection_modifyitems(config, items):
+    ref = config.getoption("tp_changed")
+    if not ref:
+        return
+    tests = selection.map_file.load(_deps_map_path(config))
+    try:
+        changed = selection.changed_files(ref, cwd=config.rootpath)
+    except selection.GitError as e:
+        raise pytest.UsageError(f"--tp-changed={ref}: {e}") from None
+    unmapped = selection.unmapped_changes(changed, tests, {item.path for item in items}, config.rootpath)
+    if unmapped:
+        names = ", ".join(os.path.relpath(path, config.rootpath) for path in unmapped[:5])
+        more = f" and {len(unmapped) - 5} more" if len(unmapped) > 5 else ""
+        warnings.warn(
+            pytest.PytestWarning(
+                f"--tp-changed: running every test, as changed Python files are not in the dependency map: "
+                f"{names}{more}"
+            ),
+            stacklevel=1,
+        )
+        return
+    selected, deselected = [], []
+    for item in items:
+        if selection.is_affected(item.nodeid, item.path, tests, changed, config.rootpath):
+            selected.append(item)
+        else:
+            deselected.append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    selection.recorder.current = item.nodeid
+    profile_files.dumper.current = item.nodeid
+    baselines.baselines.start_test(item.nodeid)
+    pattern = item.config.getoption("tp_profile")
+    if pattern and (fnmatchcase(item.nodeid, pattern) or pattern in item.nodeid):
+        profile_files.dumper.profiler = item.config.getoption("tp_profiler")
+    yield
+    selection.recorder.current = None
+    profile_files.dumper.current = None
+    profile_files.dumper.profiler = None
+    baselines.baselines.current = None
+
+
+def pytest_terminal_summary(terminalreporter):
+    if profile_files.dumper.written:
+        terminalreporter.write_line(
+            f"test_plus: wrote {len(profile_files.dumper.written)} request profiles to {profile_files.dumper.directory}"
+        )
+
+
+def pytest_sessionfinish(session):
+    _finish_dependency_map(session.config)
+    _finish_query_baselines(session.config)
+
+
+def _collect_worker_results(config, lockfile, path, tests):
+    """
+    Return `tests` merged with the partial results pytest-xdist workers left
+    next to `path`. On a worker, leave `tests` for the controller and return None.
+    """
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        lockfile.write(f"{path}.{workerinput['workerid']}", tests)
+        return None
+    collected = lockfile.merge_workers(path)
+    collected.update(tests)
+    return collected
+
+
+def _finish_query_baselines(config):
+    if not baselines.baselines.enabled:
+        return
+    path = _baselines_path(config)
+    recorded = _collect_worker_results(config, baselines.baselines_file, path, baselines.baselines.recorded)
+    if recorded is None:
+        return
+    merged = baselines.baselines.merged(recorded)
+    if merged != baselines.baselines.stored:
+        baselines.baselines_file.write(path, merged)
+
+
+def _finish_dependency_map(config):
+    if not config.getoption("tp_record_deps"):
+        return
+    path = _deps_map_path(config)
+    tests = _collect_worker_results(config, selection.map_file, path, selection.recorder.as_dict(config.rootpath))
+    if tests is None:
+        return
+    merged = selection.map_file.load(path)
+    merged.update(tests)
+    selection.map_file.write(path, merged)
@@ -0,0 +1,108 @@
+"""
+Run test client requests under cProfile or pyinstrument and write one
+profile file per request.
+
+Only the standard library is imported up front, since the pytest plugin
+imports this module in every pytest process.
+"""
+
+import cProfile
+import os
+import re
+from collections import Counter
+from contextlib import contextmanager
+
+PROFILERS = ("cprofile", "pyinstrument")
+DEFAULT_PROFILE_DIR = "profiles"
+
+
+def _safe_name(text):
+    return re.sub(r"[^\w.-]+", "_", str(text)).strip("_")
+
+
+def _write_collapsed_stacks(frame, path):
+    """
+    Write a pyinstrument frame tree as collapsed stacks, one
+    ``caller;callee <microseconds>`` line per stack, the input format of
+    flamegraph.pl and speedscope.
+    """
+
+    def walk(frame, stack, lines):
+        stack = stack + [f"{frame.function} ({frame.file_path_short}:{frame.line_no})"]
+        children = [child for child in frame.children if not child.is_synthetic]
+        self_time = frame.time - sum(child.time for child in children)
+        if self_time > 0:
+            lines.append(f"{';'.join(stack)} {round(self_time * 1e6)}")
+        for child in children:
+            walk(child, stack, lines)
+
+    lines = []
+    if frame is not None:
+        walk(frame, [], lines)
+    with open(path, "w") as f:
+        f.writelines(line + "\n" for line in lines)
+
+
+class ProfileDumper:
+    """
+    Runs requests under a profiler and writes one profile file per request.
+
+    Files are named after the test id and the URL name, with a counter
+    added when a test requests the same URL more than once. The pytest
+    plugin sets `current` to the running test's id and, for tests matching
+    ``--tp-profile``, `profiler` to the profiler every request should use.
+    """
+
+    def __init__(self):
+        self.directory = DEFAULT_PROFILE_DIR
+        self.current = None
+        self.profiler = None
+        self.written = []
+        self._names = Counter()
+
+    def path(self, test_id, url_name, suffix):
+        name = f"{_safe_name(test_id)}--{_safe_name(url_name)}"
+        self._names[name] += 1
+        if self._names[name] > 1:
+            name = f"{name}-{self._names[name]}"
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, name + suffix)
+
+    @contextmanager
+    def profile(self, profiler, test_id, url_name):
+        """Profile the block with `profiler`, one of PROFILERS, and write the result."""
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler {profiler!r}, expected one of {', '.join(PROFILERS)}")
+
+        if profiler == "cprofile":
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                path = self.path(test_id, url_name, ".prof")
+                profile.dump_stats(path)
+                self.written.append(path)
+            return
+
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            from django.core.exceptions import ImproperlyConfigured
+
+            raise ImproperlyConfigured(
+                "pyinstrument must be installed in order to use profile='pyinstrument'."
+            ) from None
+        sampler = Profiler(interval=0.0001)
+        sampler.start()
+        try:
+            yield
+        finally:
+            session = sampler.stop()
+            path = self.path(test_id, url_name, ".folded")
+            _write_collapsed_stacks(session.root_frame(), path)
+            self.written.append(path)
+
+
+dumper = ProfileDumper()
@@ -0,0 +1,218 @@
+"""
+Time where a test client request spends its time: URL resolution, each
+middleware, the view, template rendering and database queries.
+
+Running a request under cProfile or pyinstrument lives in profile_files,
+which the pytest plugin imports without loading Django.
+"""
+
+import copy
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.db import connections
+from django.template.base import Template
+from django.test import Client, signals
+from django.utils.module_loading import import_string
+
+
+class RequestProfile:
+    """
+    Where the time of the requests made in a profile_requests() block went.
+
+    All times are in seconds. `middleware` maps each middleware path to the
+    time spent in it, excluding the layers inside it, outermost first. The
+    view time includes the templates it rendered and the queries it made.
+    """
+
+    def __init__(self):
+        self.total = 0.0
+        self.url_resolution = 0.0
+        self.middleware = {}
+        self.view = 0.0
+        self.template_rendering = 0.0
+        self.template_count = 0
+        self.queries = 0.0
+        self.query_count = 0
+
+    def __str__(self):
+        rows = [("URL resolution", self.url_resolution), ("Middleware", sum(self.middleware.values()))]
+        rows += [(f"  {path}", seconds) for path, seconds in self.middleware.items()]
+        rows += [
+            ("View", self.view),
+            (f"Template rendering ({self.template_count} templates)", self.template_rendering),
+            (f"DB queries ({self.query_count} queries)", self.queries),
+        ]
+        width = max(len(label) for label, _ in rows)
+        lines = [f"Request profile: {self.total * 1000:.2f} ms total"]
+        lines += [f"  {label:<{width}}  {seconds * 1000:8.2f} ms" for label, seconds in rows]
+        return "\n".join(lines)
+
+
+class _Timer:
+    def __init__(self):
+        self.seconds = 0.0
+
+    def wrap(self, func):
+        if iscoroutinefunction(func):
+
+            async def timed(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self.seconds += perf_counter() - start
+
+        else:
+
+            def timed(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.seconds += perf_counter() - start
+
+        return timed
+
+
+def _load_timed_middleware(handler):
+    """
+    Load settings.MIDDLEWARE into `handler` like BaseHandler.load_middleware()
+    does for a sync handler, but wrap every layer in a timer.
+
+    Returns the (middleware path, timer) pairs, outermost first, followed by
+    a timer for everything inside the middleware.
+    """
+    handler._view_middleware = []
+    handler._template_response_middleware = []
+    handler._exception_middleware = []
+
+    inner = _Timer()
+    get_response = convert_exception_to_response(inner.wrap(handler._get_response))
+    layers = []
+    for middleware_path in reversed(settings.MIDDLEWARE):
+        middleware = import_string(middleware_path)
+        middleware_is_async = not getattr(middleware, "sync_capable", True)
+        adapted = handler.adapt_method_mode(
+            middleware_is_async, get_response, False, debug=settings.DEBUG, name=f"middleware {middleware_path}"
+        )
+        try:
+            mw_instance = middleware(adapted)
+        except MiddlewareNotUsed:
+            continue
+        if mw_instance is None:
+            raise ImproperlyConfigured(f"Middleware factory {middleware_path} returned None.")
+
+        if hasattr(mw_instance, "process_view"):
+            handler._view_middleware.insert(0, handler.adapt_method_mode(False, mw_instance.process_view))
+        if hasattr(mw_instance, "process_template_response"):
+            handler._template_response_middleware.append(
+                handler.adapt_method_mode(False, mw_instance.process_template_response)
+            )
+        if hasattr(mw_instance, "process_exception"):
+            handler._exception_middleware.append(handler.adapt_method_mode(False, mw_instance.process_exception))
+
+        timer = _Timer()
+        mw_sync = handler.adapt_method_mode(False, mw_instance, middleware_is_async)
+        get_response = convert_exception_to_response(timer.wrap(mw_sync))
+        layers.insert(0, (middleware_path, timer))
+
+    handler._middleware_chain = get_response
+    return layers, inner
+
+
+def _time_query(profile, execute, sql, params, many, context):
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += perf_counter() - start
+        profile.query_count += 1
+
+
+@contextmanager
+def _timed_template_rendering(profile):
+    """Time Template._render(), counting nested includes only once."""
+    original = Template._render
+    depth = 0
+
+    def _render(template, context):
+        nonlocal depth
+        if depth:
+            return original(template, context)
+        depth += 1
+        start = perf_counter()
+        try:
+            return original(template, context)
+        finally:
+            depth -= 1
+            profile.template_rendering += perf_counter() - start
+
+    Template._render = _render
+    try:
+        yield
+    finally:
+        Template._render = original
+
+
+@contextmanager
+def profile_requests(client):
+    """
+    Time the phases of every request `client` makes inside the block.
+
+    Yields a RequestProfile, which is complete once the block exits. The
+    client's handler is swapped for an instrumented copy for the duration,
+    so cookies, forced authentication and other client state still apply.
+    """
+    profile = RequestProfile()
+    original_handler = client.handler
+    handler = copy.copy(original_handler)
+    layers, inner = _load_timed_middleware(handler)
+
+    resolve, view = _Timer(), _Timer()
+    handler.resolve_request = resolve.wrap(handler.resolve_request)
+    make_view_atomic = handler.make_view_atomic
+    handler.make_view_atomic = lambda callback: view.wrap(make_view_atomic(callback))
+
+    def count_template(sender, **kwargs):
+        profile.template_count += 1
+
+    with ExitStack() as stack:
+        stack.enter_context(_timed_template_rendering(profile))
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(partial(_time_query, profile)))
+        signal_uid = f"test-plus-profile-{id(profile)}"
+        signals.template_rendered.connect(count_template, dispatch_uid=signal_uid)
+        stack.callback(signals.template_rendered.disconnect, dispatch_uid=signal_uid)
+        client.handler = handler
+        stack.callback(setattr, client, "handler", original_handler)
+
+        start = perf_counter()
+        try:
+            yield profile
+        finally:
+            profile.total += perf_counter() - start
+            profile.url_resolution = resolve.seconds
+            profile.view = view.seconds
+            # Each layer's own time is its total less the layer inside it
+            inner_times = [timer.seconds for _, timer in layers[1:]] + [inner.seconds]
+            for (path, timer), inside in zip(layers, inner_times):
+                profile.middleware[path] = timer.seconds - inside
+
+
+class InstrumentedClient(Client):
+    """
+    A test client that profiles every request, attaching a RequestProfile
+    to each response as `response.profile`.
+    """
+
+    def request(self, **request):
+        with profile_requests(self) as profile:
+            response = super().request(**request)
+        response.profile = profile
+        return response
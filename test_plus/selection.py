@@ -0,0 +1,148 @@
+"""
+Map each test to the URLs, views and templates it touched, and select the
+tests affected by the files changed since a git ref.
+
+The pytest plugin writes the map with ``--tp-record-deps`` and selects
+tests with ``--tp-changed=<git ref>``.
+"""
+
+import inspect
+import os
+import subprocess
+from pathlib import Path
+
+from .lockfile import Lockfile
+
+DEFAULT_MAP_PATH = ".test_plus_deps.json"
+MAP_VERSION = 1
+
+
+def _view_path(func):
+    """Return the dotted path and source file of a view, looking through as_view() and decorators."""
+    view = getattr(func, "view_class", None) or inspect.unwrap(func)
+    name = f"{view.__module__}.{view.__qualname__}"
+    try:
+        source = inspect.getsourcefile(view)
+    except TypeError:
+        source = None
+    return name, source
+
+
+class DependencyRecorder:
+    """Collects the URL names, views, templates and files touched by each test."""
+
+    def __init__(self):
+        self.enabled = False
+        self.current = None
+        self.tests = {}
+
+    def _entry(self):
+        return self.tests.setdefault(self.current, {"urls": set(), "views": set(), "templates": set(), "files": set()})
+
+    def record_view(self, func, url_name=None):
+        if not self.enabled or self.current is None:
+            return
+        entry = self._entry()
+        if url_name:
+            entry["urls"].add(url_name)
+        name, source = _view_path(func)
+        entry["views"].add(name)
+        if source:
+            entry["files"].add(os.path.abspath(source))
+
+    def record_templates(self, templates):
+        if not self.enabled or self.current is None or not templates:
+            return
+        entry = self._entry()
+        for template in templates:
+            entry["templates"].add(template.name)
+            origin = getattr(template.origin, "name", None)
+            if origin and os.path.isfile(origin):
+                entry["files"].add(os.path.abspath(origin))
+
+    def record_response(self, response):
+        """Record the view and templates behind a test client response."""
+        if not self.enabled or self.current is None:
+            return
+        # Imported here so that loading the pytest plugin does not load Django
+        from django.urls import Resolver404
+
+        try:
+            match = response.resolver_match
+            func = match.func
+        except (AttributeError, Resolver404):
+            # Not resolvable, e.g. a 404 from a plain URL
+            match = None
+        if match is not None:
+            self.record_view(func, match.view_name)
+        self.record_templates(getattr(response, "templates", None))
+
+    def as_dict(self, root):
+        """Return the recorded map, with file paths relative to `root`."""
+        tests = {}
+        for test_id, entry in self.tests.items():
+            tests[test_id] = {
+                "urls": sorted(entry["urls"]),
+                "views": sorted(entry["views"]),
+                "templates": sorted(entry["templates"]),
+                "files": sorted(os.path.relpath(path, root) for path in entry["files"]),
+            }
+        return tests
+
+
+recorder = DependencyRecorder()
+
+
+map_file = Lockfile(MAP_VERSION)
+
+
+class GitError(Exception):
+    """Raised when git cannot list the files changed since a ref."""
+
+
+def _git(args, cwd):
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True)
+    except FileNotFoundError:
+        raise GitError("git is not installed.") from None
+    except subprocess.CalledProcessError as e:
+        raise GitError(f"git {' '.join(args)} failed: {e.stderr.strip()}") from None
+    return result.stdout
+
+
+def changed_files(ref, cwd=None):
+    """
+    Return the absolute paths of files changed since git `ref`, including
+    uncommitted changes and untracked files. Raises GitError if git fails,
+    for example for an unknown ref or outside a checkout.
+    """
+    toplevel = _git(["rev-parse", "--show-toplevel"], cwd).strip()
+    names = _git(["diff", "--name-only", ref, "--"], cwd).splitlines()
+    names += _git(["ls-files", "--others", "--exclude-standard"], cwd).splitlines()
+    return {str(Path(toplevel, name).resolve()) for name in names if name}
+
+
+def unmapped_changes(changed, tests, test_files, root):
+    """
+    Return the changed Python files that no test in the map touched and that
+    are not test files, such as models, forms, urls.py or settings. The map
+    cannot tell which tests depend on those.
+    """
+    known = {str(Path(path).resolve()) for path in test_files}
+    for entry in tests.values():
+        known.update(str(Path(root, path).resolve()) for path in entry["files"])
+    return sorted(path for path in changed if path.endswith(".py") and path not in known)
+
+
+def is_affected(test_id, test_file, tests, changed, root):
+    """
+    Whether a test has to run given the `changed` files.
+
+    Tests missing from the map always run, as do tests whose own file
+    changed. Otherwise a test runs when one of the view or template files it
+    touched changed.
+    """
+    entry = tests.get(test_id)
+    if entry is None or str(Path(test_file).resolve()) in changed:
+        return True
+    return any(str(Path(root, path).resolve()) in changed for path in entry["files"])
@@ -0,0 +1,165 @@
+# Generated from _STATUS_CODES by scripts/generate_status_code_stub.py. Do not edit.
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+class StatusCodeAssertionMixin:
+    def assertStatusCodes(
+        self,
+        responses: Iterable[Any] | Mapping[str, Any],
+        status_code: int | Mapping[str, int] = 200,
+        msg: str | None = None,
+    ) -> None: ...
+    def assert_http_100_continue(self, response: Any = None, msg: str | None = None) -> None:
+        """Server has received request headers and client should proceed to send request body."""
+    def assert_http_101_switching_protocols(self, response: Any = None, msg: str | None = None) -> None:
+        """Server is switching protocols as requested by the client."""
+    def assert_http_102_processing(self, response: Any = None, msg: str | None = None) -> None:
+        """Server has received the request and is still processing it (WebDAV)."""
+    def assert_http_103_early_hints(self, response: Any = None, msg: str | None = None) -> None:
+        """Used to return some response headers before final HTTP message."""
+    def assert_http_200_ok(self, response: Any = None, msg: str | None = None) -> None:
+        """Request succeeded."""
+    def assert_http_201_created(self, response: Any = None, msg: str | None = None) -> None:
+        """Request succeeded and a new resource was created."""
+    def assert_http_202_accepted(self, response: Any = None, msg: str | None = None) -> None:
+        """Request received but not yet acted upon."""
+    def assert_http_203_non_authoritative_information(self, response: Any = None, msg: str | None = None) -> None:
+        """Returned metadata is not from the origin server but from a third party."""
+    def assert_http_204_no_content(self, response: Any = None, msg: str | None = None) -> None:
+        """Request succeeded but no content to send back."""
+    def assert_http_205_reset_content(self, response: Any = None, msg: str | None = None) -> None:
+        """Request succeeded and client should reset the document view."""
+    def assert_http_206_partial_content(self, response: Any = None, msg: str | None = None) -> None:
+        """Request succeeded and body contains requested ranges of data."""
+    def assert_http_207_multi_status(self, response: Any = None, msg: str | None = None) -> None:
+        """Response conveys information about multiple resources (WebDAV)."""
+    def assert_http_208_already_reported(self, response: Any = None, msg: str | None = None) -> None:
+        """Members of a DAV binding have already been enumerated (WebDAV)."""
+    def assert_http_226_im_used(self, response: Any = None, msg: str | None = None) -> None:
+        """Server has fulfilled a request for the resource with instance manipulations applied."""
+    def assert_http_300_multiple_choices(self, response: Any = None, msg: str | None = None) -> None:
+        """Request has multiple possible responses."""
+    def assert_http_301_moved_permanently(
+        self, response: Any = None, msg: str | None = None, url: str | None = None
+    ) -> None:
+        """URL of requested resource has been changed permanently."""
+    def assert_http_302_found(self, response: Any = None, msg: str | None = None, url: str | None = None) -> None:
+        """Resource temporarily located at a different URI."""
+    def assert_http_303_see_other(self, response: Any = None, msg: str | None = None) -> None:
+        """Server redirects to get the requested resource at another URI."""
+    def assert_http_304_not_modified(self, response: Any = None, msg: str | None = None) -> None:
+        """Response has not been modified, client can use cached version."""
+    def assert_http_305_use_proxy(self, response: Any = None, msg: str | None = None) -> None:
+        """Response must be accessed through a proxy (deprecated)."""
+    def assert_http_306_reserved(self, response: Any = None, msg: str | None = None) -> None:
+        """No longer used, reserved for future use."""
+    def assert_http_307_temporary_redirect(self, response: Any = None, msg: str | None = None) -> None:
+        """Resource temporarily located at a different URI, method must not change."""
+    def assert_http_308_permanent_redirect(self, response: Any = None, msg: str | None = None) -> None:
+        """Resource permanently located at a different URI, method must not change."""
+    def assert_http_400_bad_request(self, response: Any = None, msg: str | None = None) -> None:
+        """Server cannot process request due to client error."""
+    def assert_http_401_unauthorized(self, response: Any = None, msg: str | None = None) -> None:
+        """Request requires user authentication."""
+    def assert_http_402_payment_required(self, response: Any = None, msg: str | None = None) -> None:
+        """Reserved for future use in digital payment systems."""
+    def assert_http_403_forbidden(self, response: Any = None, msg: str | None = None) -> None:
+        """Server refuses to authorize the request."""
+    def assert_http_404_not_found(self, response: Any = None, msg: str | None = None) -> None:
+        """Server cannot find the requested resource."""
+    def assert_http_405_method_not_allowed(self, response: Any = None, msg: str | None = None) -> None:
+        """Request method not supported for the requested resource."""
+    def assert_http_406_not_acceptable(self, response: Any = None, msg: str | None = None) -> None:
+        """Server cannot produce a response matching the Accept headers."""
+    def assert_http_407_proxy_authentication_required(self, response: Any = None, msg: str | None = None) -> None:
+        """Client must authenticate with the proxy."""
+    def assert_http_408_request_timeout(self, response: Any = None, msg: str | None = None) -> None:
+        """Server timed out waiting for the request."""
+    def assert_http_409_conflict(self, response: Any = None, msg: str | None = None) -> None:
+        """Request conflicts with current state of the server."""
+    def assert_http_410_gone(self, response: Any = None, msg: str | None = None) -> None:
+        """Requested resource is permanently unavailable."""
+    def assert_http_411_length_required(self, response: Any = None, msg: str | None = None) -> None:
+        """Server requires Content-Length header in the request."""
+    def assert_http_412_precondition_failed(self, response: Any = None, msg: str | None = None) -> None:
+        """Client's preconditions in headers are not met."""
+    def assert_http_413_request_entity_too_large(self, response: Any = None, msg: str | None = None) -> None:
+        """Request payload is larger than server is willing to process."""
+    def assert_http_414_request_uri_too_long(self, response: Any = None, msg: str | None = None) -> None:
+        """URI requested by client is longer than server can interpret."""
+    def assert_http_415_unsupported_media_type(self, response: Any = None, msg: str | None = None) -> None:
+        """Media format of request data is not supported."""
+    def assert_http_416_requested_range_not_satisfiable(self, response: Any = None, msg: str | None = None) -> None:
+        """Range specified in Range header cannot be fulfilled."""
+    def assert_http_417_expectation_failed(self, response: Any = None, msg: str | None = None) -> None:
+        """Expectation in Expect header cannot be met."""
+    def assert_http_418_im_a_teapot(self, response: Any = None, msg: str | None = None) -> None:
+        """Server refuses to brew coffee because it is a teapot."""
+    def assert_http_421_misdirected_request(self, response: Any = None, msg: str | None = None) -> None:
+        """Request was directed to a server unable to produce a response."""
+    def assert_http_422_unprocessable_entity(self, response: Any = None, msg: str | None = None) -> None:
+        """Request is well-formed but contains semantic errors."""
+    def assert_http_423_locked(self, response: Any = None, msg: str | None = None) -> None:
+        """Resource being accessed is locked (WebDAV)."""
+    def assert_http_424_failed_dependency(self, response: Any = None, msg: str | None = None) -> None:
+        """Request failed due to failure of a previous request (WebDAV)."""
+    def assert_http_425_too_early(self, response: Any = None, msg: str | None = None) -> None:
+        """Server is unwilling to risk processing a request that might be replayed."""
+    def assert_http_426_upgrade_required(self, response: Any = None, msg: str | None = None) -> None:
+        """Client should switch to a different protocol."""
+    def assert_http_428_precondition_required(self, response: Any = None, msg: str | None = None) -> None:
+        """Server requires request to be conditional."""
+    def assert_http_429_too_many_requests(self, response: Any = None, msg: str | None = None) -> None:
+        """Client has sent too many requests in a given time period."""
+    def assert_http_431_request_header_fields_too_large(self, response: Any = None, msg: str | None = None) -> None:
+        """Request header fields are too large."""
+    def assert_http_451_unavailable_for_legal_reasons(self, response: Any = None, msg: str | None = None) -> None:
+        """Resource is unavailable due to legal reasons."""
+    def assert_http_500_internal_server_error(self, response: Any = None, msg: str | None = None) -> None:
+        """Server encountered an unexpected condition."""
+    def assert_http_501_not_implemented(self, response: Any = None, msg: str | None = None) -> None:
+        """Server does not support the functionality required."""
+    def assert_http_502_bad_gateway(self, response: Any = None, msg: str | None = None) -> None:
+        """Server received an invalid response from upstream server."""
+    def assert_http_503_service_unavailable(self, response: Any = None, msg: str | None = None) -> None:
+        """Server is not ready to handle the request."""
+    def assert_http_504_gateway_timeout(self, response: Any = None, msg: str | None = None) -> None:
+        """Server did not receive timely response from upstream server."""
+    def assert_http_505_http_version_not_supported(self, response: Any = None, msg: str | None = None) -> None:
+        """HTTP version used in request is not supported by server."""
+    def assert_http_506_variant_also_negotiates(self, response: Any = None, msg: str | None = None) -> None:
+        """Server has an internal configuration error in content negotiation."""
+    def assert_http_507_insufficient_storage(self, response: Any = None, msg: str | None = None) -> None:
+        """Server is unable to store the representation needed to complete the request (WebDAV)."""
+    def assert_http_508_loop_detected(self, response: Any = None, msg: str | None = None) -> None:
+        """Server detected an infinite loop while processing the request (WebDAV)."""
+    def assert_http_509_bandwidth_limit_exceeded(self, response: Any = None, msg: str | None = None) -> None:
+        """Bandwidth limit has been exceeded (non-standard)."""
+    def assert_http_510_not_extended(self, response: Any = None, msg: str | None = None) -> None:
+        """Further extensions to the request are required."""
+    def assert_http_511_network_authentication_required(self, response: Any = None, msg: str | None = None) -> None:
+        """Client needs to authenticate to gain network access."""
+    def response_200(self, response: Any = None, msg: str | None = None) -> None:
+        """Given response has status_code 200"""
+    def response_201(self, response: Any = None, msg: str | None = None) -> None:
+        """Given response has status_code 201"""
+    def response_204(self, response: Any = None, msg: str | None = None) -> None:
+        """Given response has status_code 204"""
+    def response_301(self, response: Any = None, msg: str | None = None) -> None:
+        """Given response has status_code 301"""
+    def response_302(self, response: Any = None, msg: str | None = None) -> None:
+        """Given response has status_code 302"""
+    def response_400(self, response: Any = None, msg: str | None = None) -> None:
+        """Given response has status_code 400"""
+    def response_401(self, response: Any = None, msg: str | None = None) -> None:
+        """Given response has status_code 401"""
+    def response_403(self, response: Any = None, msg: str | None = None) -> None:
+        """Given response has status_code 403"""
+    def response_404(self, response: Any = None, msg: str | None = None) -> None:
+        """Given response has status_code 404"""
+    def response_405(self, response: Any = None, msg: str | None = None) -> None:
+        """Given response has status_code 405"""
+    def response_409(self, response: Any = None, msg: str | None = None) -> None:
+        """Given response has status_code 409"""
+    def response_410(self, response: Any = None, msg: str | None = None) -> None:
+        """Given response has status_code 410"""
@@ -0,0 +1,153 @@
+"""
+Find the URLs of a URLconf that can be requested, request them in bulk, and
+report the results as one table.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from fnmatch import fnmatchcase
+from time import perf_counter
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver
+
+from .compat import NoReverseMatch, reverse
+
+URLCheck = namedtuple("URLCheck", "name url status queries seconds")
+URLCheck.__doc__ = """The result of requesting one URL in a sweep. `status` is the exception name if the view raised."""
+
+
+def url_names(resolver=None, namespace=""):
+    """
+    Yield the name of every named pattern in `resolver`, ROOT_URLCONF's by
+    default, qualified with its namespaces and in URLconf order. Names
+    shared by several patterns are yielded once.
+    """
+    seen = set()
+    for pattern in (resolver or get_resolver()).url_patterns:
+        if isinstance(pattern, URLResolver):
+            prefix = f"{namespace}{pattern.namespace}:" if pattern.namespace else namespace
+            names = url_names(pattern, prefix)
+        else:
+            names = [namespace + pattern.name] if pattern.name else []
+        for name in names:
+            if name not in seen:
+                seen.add(name)
+                yield name
+
+
+def _matches(name, patterns):
+    return any(fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def reverse_url(name, args_provider=None):
+    """
+    Reverse `name` without arguments, or with the ones `args_provider`, a
+    callable taking the URL name or a dict keyed by it, supplies as a dict of
+    keyword arguments or a sequence of positional ones. Returns None when
+    the pattern needs arguments that the provider does not supply.
+    """
+    try:
+        return reverse(name)
+    except NoReverseMatch:
+        pass
+    if callable(args_provider):
+        arguments = args_provider(name)
+    else:
+        arguments = (args_provider or {}).get(name)
+    if arguments is None:
+        return None
+    if isinstance(arguments, dict):
+        return reverse(name, kwargs=arguments)
+    return reverse(name, args=arguments)
+
+
+def select_url_names(include=None, exclude=None):
+    """Return the URL names matching the `include` glob patterns, if any, and none of the `exclude` ones."""
+    return [
+        name
+        for name in url_names()
+        if (include is None or _matches(name, include)) and not (exclude and _matches(name, exclude))
+    ]
+
+
+def sweep_urls(include=None, exclude=None, args_provider=None):
+    """
+    Return the (name, URL) pairs of the patterns to sweep.
+
+    `include` and `exclude` are glob patterns matched against the URL names.
+    Patterns that need arguments are reversed with reverse_url(), and skipped
+    when `args_provider` does not supply them.
+    """
+    urls = []
+    for name in select_url_names(include, exclude):
+        url = reverse_url(name, args_provider)
+        if url is not None:
+            urls.append((name, url))
+    return urls
+
+
+def check_url(client, name, url, using=DEFAULT_DB_ALIAS):
+    """GET `url` with `client`, counting its queries and timing it."""
+    with CaptureQueriesContext(connections[using]) as queries:
+        start = perf_counter()
+        try:
+            status = client.get(url).status_code
+        except Exception as e:  # noqa: BLE001 - one broken view must not stop the sweep
+            status = type(e).__name__
+        seconds = perf_counter() - start
+    return URLCheck(name, url, status, len(queries), seconds)
+
+
+def check_urls(client, urls, workers=None):
+    """
+    Check every (name, URL) pair in order, or across `workers` threads.
+
+    Each thread uses its own client with a copy of `client`'s cookies, and
+    its own database connections, which only see committed data. Workers
+    cannot be used inside a transaction, such as a Django TestCase's.
+    """
+    if not workers:
+        return [check_url(client, name, url) for name, url in urls]
+    atomic = [connection.alias for connection in connections.all(initialized_only=True) if connection.in_atomic_block]
+    if atomic:
+        raise ValueError(
+            f"Cannot check URLs with workers inside a transaction on {', '.join(atomic)}: the worker threads' "
+            "connections would not see its data and could be locked out by it. Use a TransactionTestCase."
+        )
+
+    def check_in_thread(name, url):
+        thread_client = type(client)()
+        thread_client.cookies = copy(client.cookies)
+        try:
+            return check_url(thread_client, name, url)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda pair: check_in_thread(*pair), urls))
+
+
+def format_rows(header, rows, left=3):
+    """Format rows of strings as a table, aligning all but the first `left` columns right."""
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+
+    def line(row):
+        cells = [
+            cell.ljust(width) if i < left else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths))
+        ]
+        return "  ".join(cells).rstrip()
+
+    return "\n".join([line(header), *(line(row) for row in rows)])
+
+
+def format_table(checks):
+    """Format URL checks as a table with one row per URL."""
+    header = ("URL name", "Path", "Status", "Queries", "ms")
+    rows = [
+        (check.name, check.url, str(check.status), str(check.queries), f"{check.seconds * 1000:.1f}")
+        for check in checks
+    ]
+    return format_rows(header, rows)
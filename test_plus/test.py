@@ -1,17 +1,47 @@
-from functools import partial
-
+import difflib
+import inspect
+import json
+import re
+from collections import Counter, namedtuple
+from contextlib import ExitStack, contextmanager, nullcontext
+from functools import cache, partial
+from importlib import import_module
+from urllib.parse import parse_qsl, urljoin, urlsplit, urlunsplit
+
+from asgiref.sync import async_to_sync
+from django.apps import apps
 from django.conf import settings
-from django.contrib.auth import get_user_model
-from django.core.exceptions import ImproperlyConfigured
-from django.db import DEFAULT_DB_ALIAS, connections
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections, router
 from django.db.models import Q
+from django.dispatch import receiver
+from django.http.request import HttpHeaders
 from django.shortcuts import resolve_url
-from django.test import RequestFactory, signals
+from django.test import Client, RequestFactory, signals
 from django.test import TestCase as DjangoTestCase
-from django.test.client import store_rendered_templates
+from django.test import TransactionTestCase as DjangoTransactionTestCase
+from django.test import client as client_module
+from django.test.client import MULTIPART_CONTENT, FakePayload
+from django.test.signals import setting_changed
 from django.test.utils import CaptureQueriesContext
-
+from django.utils.crypto import constant_time_compare
+from django.utils.encoding import force_bytes
+from django.utils.functional import cached_property
+from django.utils.http import urlencode
+from django.utils.module_loading import import_string
+
+from test_plus.baselines import baselines
+from test_plus.profile_files import dumper
+from test_plus.profiling import InstrumentedClient, RequestProfile, _timed_template_rendering, profile_requests
+from test_plus.selection import recorder
 from test_plus.status_codes import StatusCodeAssertionMixin
+from test_plus.sweep import check_urls, format_rows, format_table, reverse_url, select_url_names, sweep_urls
 
 from .compat import NoReverseMatch, assertMessages, assertURLEqual, get_api_client, reverse
 
@@ -20,23 +50,373 @@ class NoPreviousResponse(Exception):
     pass
 
 
-class _AssertNumQueriesLessThanContext(CaptureQueriesContext):
-    def __init__(self, test_case, num, connection, verbose=False):
+RequestRecord = namedtuple("RequestRecord", "method url status headers queries")
+RequestRecord.__doc__ = """What request_batch() keeps of a response: status, a few headers and query count."""
+
+
+class LeanResponse:
+    """
+    What a test case keeps as `last_response` in lean mode: the status code,
+    headers, body and the templates rendered, but not the request, the
+    template context or the client. The body is only decoded when `text`
+    or json() is used.
+    """
+
+    streaming = False
+    context = None
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.charset = response.charset
+        self.content = response.content
+        self.templates = response.templates
+
+    def __getitem__(self, header):
+        return self.headers[header]
+
+    def get(self, header, alternate=None):
+        return self.headers.get(header, alternate)
+
+    def has_header(self, header):
+        return header in self.headers
+
+    @property
+    def url(self):
+        return self.headers["Location"]
+
+    @cached_property
+    def text(self):
+        return self.content.decode(self.charset or "utf-8")
+
+    def json(self, **kwargs):
+        return json.loads(self.text, **kwargs)
+
+
+def _store_template(store, signal, sender, template, context, **kwargs):
+    store.setdefault("templates", []).append(template)
+
+
+_LEAN_NO_CONTEXT = "The last response has no template context. Lean responses never do; pass lean=False."
+
+
+def _local_url(url, host):
+    """Drop the scheme and host from `url` when it points at `host`, as assertRedirects() does."""
+    parts = urlsplit(url)
+    if parts.netloc == host:
+        return urlunsplit(("", "", parts.path, parts.query, parts.fragment))
+    return url
+
+
+def _describe_form_errors(form):
+    """List a form's errors, one per line with its code, grouped by field."""
+    lines = []
+    for field, errors in form.errors.as_data().items():
+        lines.append(f"* {field}")
+        lines += [f"  * {' '.join(error.messages)} (code={error.code!r})" for error in errors]
+    return "\n".join(lines)
+
+
+@contextmanager
+def _lean_template_capture():
+    """Make the test client record the templates rendered, but not copy their contexts."""
+    original = client_module.store_rendered_templates
+    client_module.store_rendered_templates = _store_template
+    try:
+        yield
+    finally:
+        client_module.store_rendered_templates = original
+
+
+class _AssertNumQueriesLessThanContext:
+    """
+    Counts the queries run on one or more database connections inside the
+    block. `captures` maps each alias to its CaptureQueriesContext. Like a
+    CaptureQueriesContext, it can be iterated and indexed for the captured
+    queries, and has a `connection` when it counts a single alias.
+    """
+
+    def __init__(self, test_case, num, aliases, verbose=False):
         self.test_case = test_case
         self.num = num
         self.verbose = verbose
-        super().__init__(connection)
+        self.captures = {alias: CaptureQueriesContext(connections[alias]) for alias in aliases}
+        if len(aliases) == 1:
+            self.connection = connections[aliases[0]]
+
+    @property
+    def captured_queries(self):
+        return [query for capture in self.captures.values() for query in capture.captured_queries]
+
+    def __iter__(self):
+        return iter(self.captured_queries)
+
+    def __getitem__(self, index):
+        return self.captured_queries[index]
+
+    def __len__(self):
+        return sum(len(capture) for capture in self.captures.values())
+
+    def __enter__(self):
+        self.requests_before = len(baselines.requested)
+        self._stack = ExitStack()
+        for capture in self.captures.values():
+            self._stack.enter_context(capture)
+        return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        super().__exit__(exc_type, exc_value, traceback)
+        self._stack.close()
         if exc_type is not None:
             return
         executed = len(self)
+        baseline_error = None
+        if baselines.enabled:
+            db_time = sum(float(q["time"]) for q in self.captured_queries)
+            test_id = baselines.current or self.test_case.id()
+            baseline_error = baselines.check(test_id, self.requests_before, executed, db_time)
         msg = f"{executed} queries executed, expected less than {self.num}"
+        if len(self.captures) > 1:
+            per_alias = (
+                f"{alias}: {len(capture)} queries in {sum(float(q['time']) for q in capture) * 1000:.2f} ms"
+                for alias, capture in self.captures.items()
+            )
+            msg += f" ({', '.join(per_alias)})"
         if self.verbose:
-            queries = "\n\n".join(q["sql"] for q in self.captured_queries)
+            if len(self.captures) > 1:
+                queries = "\n\n".join(
+                    f"[{alias}] {q['sql']}" for alias, capture in self.captures.items() for q in capture
+                )
+            else:
+                queries = "\n\n".join(q["sql"] for q in self.captured_queries)
             msg += f". Executed queries were:\n\n{queries}"
         self.test_case.assertLess(executed, self.num, msg)
+        if baseline_error:
+            self.test_case.fail(baseline_error)
+
+
+def _most_rendered(templates, limit=10):
+    counts = Counter(template.name or "<unknown source>" for template in templates)
+    lines = [f"{count:6}  {name}" for name, count in counts.most_common(limit)]
+    return ". Most rendered templates were:\n\n" + "\n".join(lines)
+
+
+class _AssertTemplatesContext:
+    """Captures the templates rendered inside the block, and the time spent rendering them."""
+
+    def __init__(self, test_case, num=None, seconds=None):
+        self.test_case = test_case
+        self.num = num
+        self.seconds = seconds
+
+    def _on_template_render(self, sender, template, **kwargs):
+        self.templates.append(template)
+
+    def __enter__(self):
+        self.templates = []
+        self.profile = RequestProfile()
+        self._stack = ExitStack()
+        signal_uid = f"template-assert-{id(self)}"
+        signals.template_rendered.connect(self._on_template_render, dispatch_uid=signal_uid)
+        self._stack.callback(signals.template_rendered.disconnect, dispatch_uid=signal_uid)
+        self._stack.enter_context(_timed_template_rendering(self.profile))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stack.close()
+        if exc_type is not None:
+            return
+        rendered = len(self.templates)
+        if self.num is not None:
+            msg = f"{rendered} templates rendered, expected less than {self.num}"
+            self.test_case.assertLess(rendered, self.num, msg + _most_rendered(self.templates))
+        if self.seconds is not None:
+            elapsed = self.profile.template_rendering
+            msg = (
+                f"Rendering {rendered} templates took {elapsed * 1000:.2f} ms, "
+                f"expected less than {self.seconds * 1000:.2f} ms"
+            )
+            self.test_case.assertLess(elapsed, self.seconds, msg + _most_rendered(self.templates))
+
+
+_MISSING = object()
+
+
+class _CacheCounter:
+    """
+    Counts the reads, hits, misses, writes and deletes made through one
+    cache backend while installed.
+
+    Reads and writes are counted per key. Calls a backend makes to itself,
+    such as BaseCache.get_many() calling get(), are counted once.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.gets = self.hits = self.misses = self.sets = self.deletes = 0
+        self.missed_keys = []
+        self._depth = 0
+
+    @contextmanager
+    def _call(self):
+        self._depth += 1
+        try:
+            yield self._depth == 1
+        finally:
+            self._depth -= 1
+
+    def _counting(self, method, field, keys=lambda key, *args, **kwargs: [key]):
+        def counted(*args, **kwargs):
+            with self._call() as outermost:
+                result = method(*args, **kwargs)
+            if outermost:
+                setattr(self, field, getattr(self, field) + len(keys(*args, **kwargs)))
+            return result
+
+        return counted
+
+    def install(self, stack):
+        cache = caches[self.alias]
+        get, get_many = cache.get, cache.get_many
+
+        def counted_get(key, default=None, version=None):
+            with self._call() as outermost:
+                value = get(key, _MISSING, version=version)
+            if outermost:
+                self._read([key], [] if value is _MISSING else [key])
+            return default if value is _MISSING else value
+
+        def counted_get_many(keys, version=None):
+            keys = list(keys)
+            with self._call() as outermost:
+                values = get_many(keys, version=version)
+            if outermost:
+                self._read(keys, values)
+            return values
+
+        methods = {
+            "get": counted_get,
+            "get_many": counted_get_many,
+            "set": self._counting(cache.set, "sets"),
+            "add": self._counting(cache.add, "sets"),
+            "set_many": self._counting(cache.set_many, "sets", keys=lambda data, *args, **kwargs: list(data)),
+            "delete": self._counting(cache.delete, "deletes"),
+            "delete_many": self._counting(cache.delete_many, "deletes", keys=lambda keys, *args, **kwargs: list(keys)),
+        }
+        for name, method in methods.items():
+            if name in vars(cache):
+                stack.callback(setattr, cache, name, vars(cache)[name])
+            else:
+                stack.callback(delattr, cache, name)
+            setattr(cache, name, method)
+
+    def _read(self, keys, found):
+        self.gets += len(keys)
+        self.hits += len(found)
+        missed = [key for key in keys if key not in found]
+        self.misses += len(missed)
+        self.missed_keys += missed
+
+    def __str__(self):
+        return (
+            f"{self.alias}: {self.gets} gets ({self.hits} hits, {self.misses} misses), "
+            f"{self.sets} sets, {self.deletes} deletes"
+        )
+
+
+class _AssertCacheContext:
+    """
+    Counts calls to the cache backends inside the block and checks them
+    against a minimum number of hits, a minimum hit ratio and a maximum
+    number of misses.
+    """
+
+    def __init__(self, test_case, using=None, min_hits=None, min_ratio=None, max_misses=None):
+        self.test_case = test_case
+        self.aliases = list(settings.CACHES) if using is None else [using]
+        self.min_hits = min_hits
+        self.min_ratio = min_ratio
+        self.max_misses = max_misses
+
+    def _total(self, field):
+        return sum(getattr(counter, field) for counter in self.counters)
+
+    gets = property(lambda self: self._total("gets"))
+    hits = property(lambda self: self._total("hits"))
+    misses = property(lambda self: self._total("misses"))
+    sets = property(lambda self: self._total("sets"))
+    deletes = property(lambda self: self._total("deletes"))
+
+    @property
+    def hit_ratio(self):
+        """The share of cache reads that were hits, or None if nothing was read."""
+        return self.hits / self.gets if self.gets else None
+
+    def __enter__(self):
+        self.counters = [_CacheCounter(alias) for alias in self.aliases]
+        self._stack = ExitStack()
+        for counter in self.counters:
+            counter.install(self._stack)
+        return self
+
+    def _summary(self):
+        summary = ". Cache calls were:\n\n" + "\n".join(str(counter) for counter in self.counters)
+        missed_keys = [key for counter in self.counters for key in counter.missed_keys]
+        if missed_keys:
+            summary += "\n\nMissed keys were:\n\n" + "\n".join(str(key) for key in missed_keys)
+        return summary
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stack.close()
+        if exc_type is not None:
+            return
+        if self.min_hits is not None:
+            msg = f"{self.hits} cache hits, expected at least {self.min_hits}"
+            self.test_case.assertGreaterEqual(self.hits, self.min_hits, msg + self._summary())
+        if self.min_ratio is not None:
+            ratio = self.hit_ratio or 0
+            msg = f"Cache hit ratio was {ratio:.0%}, expected at least {self.min_ratio:.0%}"
+            self.test_case.assertGreaterEqual(ratio, self.min_ratio, msg + self._summary())
+        if self.max_misses is not None:
+            msg = f"{self.misses} cache misses, expected at most {self.max_misses}"
+            self.test_case.assertLessEqual(self.misses, self.max_misses, msg + self._summary())
+
+
+def _find_anchor(needle, haystack, min_length=8):
+    """
+    Find where `needle` most plausibly starts in `haystack`.
+
+    Searches for ever smaller chunks of `needle` with str.find(), so the
+    scan runs at C speed even on very large responses. Returns the position
+    in `haystack` that lines up with the start of `needle`, or None when no
+    chunk of at least `min_length` characters is found.
+    """
+    length = len(needle)
+    while length >= min(min_length, len(needle)) and length > 0:
+        for offset in range(0, len(needle) - length + 1, length):
+            position = haystack.find(needle[offset : offset + length])
+            if position != -1:
+                return max(position - offset, 0)
+        length //= 2
+    return None
+
+
+def _response_excerpt(content, start, end):
+    excerpt = content[start:end]
+    if start > 0:
+        excerpt = "..." + excerpt
+    if end < len(content):
+        excerpt += "..."
+    return excerpt
+
+
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+
+def _url_parts(url, **query):
+    """Split `url` for comparison, with its query string, plus `query`, sorted and decoded."""
+    parts = urlsplit(url)
+    params = sorted(parse_qsl(parts.query, keep_blank_values=True) + list(query.items()))
+    return parts.scheme, parts.netloc, parts.path, params
 
 
 class login:
@@ -50,6 +430,8 @@ class login:
         self.testcase = testcase
         User = get_user_model()
 
+        # A cached session stands in for a login only when no credentials are given
+        use_cached = bool(args) and isinstance(args[0], User) and not credentials
         if args and isinstance(args[0], User):
             USERNAME_FIELD = getattr(User, "USERNAME_FIELD", "username")
             credentials.update(
@@ -58,6 +440,15 @@ class login:
                 }
             )
 
+        self.cached = False
+        if use_cached:
+            session_key = testcase._cached_login_session(args[0])
+            if session_key is not None:
+                # A session made by cache_login(): just present its cookie
+                testcase.client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+                self.cached = True
+                return
+
         if not credentials.get("password", False):
             credentials["password"] = "password"
 
@@ -68,7 +459,238 @@ class login:
         pass
 
     def __exit__(self, *args):
-        self.testcase.client.logout()
+        if self.cached:
+            # Logging out would delete the cached session
+            self.testcase.client.cookies.pop(settings.SESSION_COOKIE_NAME, None)
+        else:
+            self.testcase.client.logout()
+
+
+@cache
+def _pooled_request_factory(factory_class):
+    """One shared factory per factory class; building requests never mutates it."""
+    return factory_class()
+
+
+class RequestTemplate:
+    """
+    A pre-built request that can be cloned cheaply.
+
+    The WSGI environ is built once by the request factory. Each call to
+    build() copies it and applies the per-call data, user and headers, so
+    tests that call a view thousands of times skip rebuilding the environ.
+    """
+
+    def __init__(self, factory, method="get", path="/", content_type=None, **extra):
+        self.factory = factory
+        self.method = method.upper()
+        if content_type is None:
+            content_type = MULTIPART_CONTENT if self.method == "POST" else "application/octet-stream"
+        self.content_type = content_type
+        self.environ = factory.generic(self.method, path, **extra).environ
+
+    def build(self, data=None, user=None, headers=None, content_type=None):
+        """Return a fresh request cloned from the template."""
+        environ = self.environ.copy()
+        if headers:
+            environ.update(HttpHeaders.to_wsgi_names(headers))
+
+        body = b""
+        if data is not None:
+            if self.method in ("GET", "HEAD", "TRACE"):
+                environ["QUERY_STRING"] = urlencode(data, doseq=True)
+            else:
+                content_type = content_type or self.content_type
+                data = self.factory._encode_json(data, content_type)
+                if self.method == "POST":
+                    body = self.factory._encode_data(data, content_type)
+                else:
+                    body = force_bytes(data, settings.DEFAULT_CHARSET)
+                environ["CONTENT_TYPE"] = content_type
+                environ["CONTENT_LENGTH"] = str(len(body))
+        environ["wsgi.input"] = FakePayload(body)
+
+        request = WSGIRequest(environ)
+        if user is not None:
+            request.user = user
+        return request
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def _call_view(view_func, request):
+    """Call a view handler, running it to completion if it is `async def`."""
+    response = view_func(request)
+    if inspect.isawaitable(response):
+        response = async_to_sync(_await)(response)
+    return response
+
+
+class _MiddlewareChain:
+    """
+    A chain of middleware wrapped around a directly invoked view.
+
+    Built the same way as BaseHandler.load_middleware() builds a synchronous
+    chain, adapting async-only middleware with async_to_sync, but the
+    innermost handler calls the view passed to __call__() instead of
+    resolving a URL. Exceptions are not converted into responses, so they
+    reach the test.
+    """
+
+    def __init__(self, middleware_paths):
+        adapt = BaseHandler().adapt_method_mode
+        self.view_middleware = []
+        self.template_response_middleware = []
+        handler = self._get_response
+        handler_is_async = False
+        for middleware_path in reversed(middleware_paths):
+            middleware = import_string(middleware_path)
+            middleware_can_sync = getattr(middleware, "sync_capable", True)
+            middleware_can_async = getattr(middleware, "async_capable", False)
+            if not middleware_can_sync and not middleware_can_async:
+                raise RuntimeError(
+                    f"Middleware {middleware_path} must have at least one of sync_capable/async_capable set to True."
+                )
+            if not handler_is_async and middleware_can_sync:
+                middleware_is_async = False
+            else:
+                middleware_is_async = middleware_can_async
+            try:
+                mw_instance = middleware(adapt(middleware_is_async, handler, handler_is_async))
+            except MiddlewareNotUsed:
+                continue
+            if mw_instance is None:
+                raise ImproperlyConfigured(f"Middleware factory {middleware_path} returned None.")
+            if hasattr(mw_instance, "process_view"):
+                self.view_middleware.insert(0, adapt(False, mw_instance.process_view))
+            if hasattr(mw_instance, "process_template_response"):
+                self.template_response_middleware.append(adapt(False, mw_instance.process_template_response))
+            handler = mw_instance
+            handler_is_async = middleware_is_async
+        self.handler = adapt(False, handler, handler_is_async)
+
+    def __call__(self, request, view_func):
+        request._test_plus_view_func = view_func
+        try:
+            return self.handler(request)
+        finally:
+            del request._test_plus_view_func
+
+    def _get_response(self, request):
+        view_func = request._test_plus_view_func
+        for process_view in self.view_middleware:
+            response = process_view(request, view_func, (), {})
+            if response:
+                return response
+        response = _call_view(view_func, request)
+        # Run process_template_response() hooks and render before handing
+        # the response back out, as BaseHandler does, so middleware sees the
+        # final content.
+        if hasattr(response, "render") and callable(response.render):
+            for process_template_response in self.template_response_middleware:
+                response = process_template_response(request, response)
+                if response is None:
+                    raise ValueError(
+                        f"{process_template_response.__self__.__class__.__name__}.process_template_response "
+                        "didn't return an HttpResponse object. It returned None instead."
+                    )
+            response = response.render()
+        return response
+
+
+@cache
+def _middleware_chain(middleware_paths):
+    return _MiddlewareChain(middleware_paths)
+
+
+@receiver(setting_changed)
+def _clear_middleware_chains(**kwargs):
+    # Middleware reads settings when it is instantiated.
+    _middleware_chain.cache_clear()
+
+
+_WRITE_SQL = re.compile(
+    r"""^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+[`"\[]?([^\s`"\]\(]+)""",
+    re.IGNORECASE,
+)
+_READ_SQL = re.compile(
+    r"^\s*(?:SELECT|SAVEPOINT|RELEASE|ROLLBACK|BEGIN|COMMIT|PRAGMA|SET|SHOW|EXPLAIN)\b", re.IGNORECASE
+)
+
+
+class _WriteTracker:
+    """
+    An execute_wrapper recording the tables written by INSERT, UPDATE and
+    DELETE statements. Any other statement that may write, such as DDL or a
+    CTE, marks the database as needing a full flush.
+    """
+
+    def __init__(self):
+        self.tables = set()
+        self.unknown = False
+
+    def __call__(self, execute, sql, params, many, context):
+        match = _WRITE_SQL.match(sql)
+        if match:
+            self.tables.add(match.group(1))
+        elif not _READ_SQL.match(sql):
+            self.unknown = True
+        return execute(sql, params, many, context)
+
+    def reset(self):
+        self.tables.clear()
+        self.unknown = False
+
+
+class _TableState:
+    """The model tables of a database, and which held rows before any test wrote to them."""
+
+    def __init__(self, alias):
+        self.models = {}
+        self.seeded = set()
+        existing = set(connections[alias].introspection.table_names())
+        for model in apps.get_models(include_auto_created=True):
+            table = model._meta.db_table
+            # Proxies share their concrete model's table, and Django does not flush unmanaged ones
+            if model._meta.proxy or not model._meta.managed:
+                continue
+            if table not in existing or not router.allow_migrate_model(alias, model):
+                continue
+            self.models[table] = model
+            if model._base_manager.using(alias).exists():
+                self.seeded.add(table)
+
+    def referencing_closure(self, tables):
+        """`tables` plus every table that references them, directly or not."""
+        closure = set(tables)
+        pending = list(tables)
+        while pending:
+            model = self.models[pending.pop()]
+            referencing = [
+                (rel.through if rel.many_to_many else rel.related_model)._meta.db_table
+                for rel in model._meta.related_objects
+            ]
+            referencing += [field.remote_field.through._meta.db_table for field in model._meta.local_many_to_many]
+            for table in referencing:
+                if table in self.models and table not in closure:
+                    closure.add(table)
+                    pending.append(table)
+        return closure
+
+
+# Bytes encoded by json_payload(), by test class and then payload name.
+_payloads = {}
+
+# (session key, lasts for the class) pairs made by cache_login(), by test
+# class and then user pk. Kept outside the class so Django's TestCase does
+# not wrap them as test data.
+_login_sessions = {}
+
+# Computed once per database per process, before the first
+# TransactionTestCase writes anything.
+_table_states = {}
 
 
 class BaseTestCase(StatusCodeAssertionMixin):
@@ -77,30 +699,78 @@ class BaseTestCase(StatusCodeAssertionMixin):
     """
 
     user_factory = None
+    response_diff_context = 200
+
+    # Response headers request_batch() keeps
+    batch_headers = ("Content-Type", "Location")
+
+    # Keep a LeanResponse as last_response, without template contexts
+    lean_responses = False
+
+    # True during TestCase.setUpClass(), which runs setUpTestData(), so
+    # cache_login() knows its sessions last as long as the class
+    _in_class_setup = False
 
     def __init__(self, *args, **kwargs):
         self.last_response = None
 
-    def tearDown(self):
-        self.client.logout()
-
-    def print_form_errors(self, response_or_form=None):
-        """A utility method for quickly debugging responses with form errors."""
+    def _release_responses(self):
+        # The test case outlives the test, so let go of the last response
+        self.last_response = None
+        self.context = None
 
+    def _which_form(self, response_or_form, name):
         if response_or_form is None:
             response_or_form = self.last_response
 
         if hasattr(response_or_form, "errors"):
-            form = response_or_form
-        elif hasattr(response_or_form, "context"):
-            form = response_or_form.context["form"]
-        else:
-            raise TypeError(
-                "print_form_errors requires the response_or_form argument to either be a Django http response or a form instance."
-            )
+            return response_or_form
+        if isinstance(response_or_form, LeanResponse):
+            self.fail(_LEAN_NO_CONTEXT)
+        if hasattr(response_or_form, "context"):
+            return response_or_form.context["form"]
+        raise TypeError(
+            f"{name} requires the response_or_form argument to either be a Django http response or a form instance."
+        )
 
+    def print_form_errors(self, response_or_form=None):
+        """A utility method for quickly debugging responses with form errors."""
+        form = self._which_form(response_or_form, "print_form_errors")
         print(form.errors.as_text())
 
+    def assertFormValid(self, response_or_form=None, msg=None):
+        """
+        Assert that a form is valid. It accepts a form instance or a
+        response, and defaults to self.last_response, like
+        print_form_errors().
+        """
+        form = self._which_form(response_or_form, "assertFormValid")
+        if not form.is_bound:
+            self.fail(self._formatMessage(msg, "The form is not bound to any data."))
+        if not form.is_valid():
+            self.fail(self._formatMessage(msg, f"The form is not valid:\n{_describe_form_errors(form)}"))
+
+    def assertFormErrors(self, response_or_form=None, field=None, code=None, msg=None):
+        """
+        Assert that a form has errors: any error at all, or one on `field`,
+        or one with the error `code`, or one with `code` on `field`. Use
+        NON_FIELD_ERRORS ("__all__") as `field` for errors from Form.clean().
+        """
+        form = self._which_form(response_or_form, "assertFormErrors")
+        if not form.is_bound:
+            self.fail(self._formatMessage(msg, "The form is not bound to any data."))
+        errors = form.errors.as_data()
+        fields = errors if field is None else [field]
+        if any(error.code == code or code is None for name in fields for error in errors.get(name, [])):
+            return
+
+        if code is None:
+            expected = f"Expected errors on {field!r}" if field is not None else "Expected the form to have errors"
+        else:
+            expected = f"Expected an error with code {code!r}" + (f" on {field!r}" if field is not None else "")
+        found = f"the form's errors were:\n{_describe_form_errors(form)}" if errors else "the form is valid."
+        self.fail(self._formatMessage(msg, f"{expected}, but {found}"))
+
     def _resolve_url(self, url_name, *args, **kwargs):
         """
         Reverse url_name, falling back to treating it as a plain URL.
@@ -113,15 +783,47 @@ class BaseTestCase(StatusCodeAssertionMixin):
         except NoReverseMatch:
             return url_name
 
+    def _request_profiler(self, profile, url_name):
+        """
+        Return a context manager for the profiling `profile` asks for. It
+        yields a RequestProfile when the phase breakdown is wanted.
+        """
+        if isinstance(profile, str):
+            return dumper.profile(profile, dumper.current or self.id(), url_name)
+        if profile and not isinstance(self.client, InstrumentedClient):
+            return profile_requests(self.client)
+        return nullcontext()
+
     def request(self, method_name, url_name, *args, **kwargs):
         """
         Request url by name using reverse() through method
 
         If reverse raises NoReverseMatch attempt to use it as a URL.
+
+        `data` may be bytes that are already encoded, for example by
+        json_payload(), in which case `content_type` is required and the
+        body is sent as is, without going through the client's encoding or
+        DRF's renderers.
+
+        Pass lean=True, or set `lean_responses` on the class, to skip copying
+        template contexts and keep only a LeanResponse as `last_response`.
+        The full response is still returned.
+
+        Pass profile=True to time the phases of the request; the breakdown is
+        attached to the response as `profile`. Pass profile="cprofile" or
+        profile="pyinstrument" to run the request under that profiler and
+        write the result to a file named after the test and `url_name`.
         """
         follow = kwargs.pop("follow", False)
+        profile = kwargs.pop("profile", None)
+        lean = kwargs.pop("lean", self.lean_responses)
         extra = kwargs.pop("extra", {})
         data = kwargs.pop("data", {})
+        content_type = kwargs.pop("content_type", None)
+        if content_type is not None:
+            extra = {**extra, "content_type": content_type}
+        elif isinstance(data, bytes) and "content_type" not in extra:
+            raise ValueError("Pass content_type along with pre-encoded bytes data.")
 
         valid_method_names = ["get", "post", "put", "patch", "head", "trace", "options", "delete"]
 
@@ -130,10 +832,25 @@ class BaseTestCase(StatusCodeAssertionMixin):
         else:
             raise LookupError(f"Cannot find the method {method_name}")
 
-        self.last_response = method(self._resolve_url(url_name, *args, **kwargs), data=data, follow=follow, **extra)
-
+        if profile is None:
+            profile = dumper.profiler
+        url = self._resolve_url(url_name, *args, **kwargs)
+        baselines.record_request(url_name)
+        with (
+            self._request_profiler(profile, url_name) as request_profile,
+            _lean_template_capture() if lean else nullcontext(),
+        ):
+            response = method(url, data=data, follow=follow, **extra)
+        if request_profile is not None:
+            response.profile = request_profile
+        recorder.record_response(response)
+
+        if lean and not response.streaming:
+            self.last_response = LeanResponse(response)
+        else:
+            self.last_response = response
         self.context = self.last_response.context
-        return self.last_response
+        return response
 
     def get(self, url_name, *args, **kwargs):
         return self.request("get", url_name, *args, **kwargs)
@@ -168,57 +885,41 @@ class BaseTestCase(StatusCodeAssertionMixin):
 
         return self.last_response
 
-    def _assert_response_code(self, status_code, response=None, msg=None):
-        response = self._which_response(response)
-        self.assertEqual(response.status_code, status_code, msg)
-
-    def response_200(self, response=None, msg=None):
-        """Given response has status_code 200"""
-        self._assert_response_code(200, response, msg)
-
-    def response_201(self, response=None, msg=None):
-        """Given response has status_code 201"""
-        self._assert_response_code(201, response, msg)
-
-    def response_204(self, response=None, msg=None):
-        """Given response has status_code 204"""
-        self._assert_response_code(204, response, msg)
-
-    def response_301(self, response=None, msg=None):
-        """Given response has status_code 301"""
-        self._assert_response_code(301, response, msg)
-
-    def response_302(self, response=None, msg=None):
-        """Given response has status_code 302"""
-        self._assert_response_code(302, response, msg)
-
-    def response_400(self, response=None, msg=None):
-        """Given response has status_code 400"""
-        self._assert_response_code(400, response, msg)
-
-    def response_401(self, response=None, msg=None):
-        """Given response has status_code 401"""
-        self._assert_response_code(401, response, msg)
-
-    def response_403(self, response=None, msg=None):
-        """Given response has status_code 403"""
-        self._assert_response_code(403, response, msg)
-
-    def response_404(self, response=None, msg=None):
-        """Given response has status_code 404"""
-        self._assert_response_code(404, response, msg)
-
-    def response_405(self, response=None, msg=None):
-        """Given response has status_code 405"""
-        self._assert_response_code(405, response, msg)
-
-    def response_409(self, response=None, msg=None):
-        """Given response has status_code 409"""
-        self._assert_response_code(409, response, msg)
-
-    def response_410(self, response=None, msg=None):
-        """Given response has status_code 410"""
-        self._assert_response_code(410, response, msg)
+    def request_batch(self, items):
+        """
+        Make every request in `items` and check its status code.
+
+        Each item is a (method, url_name, kwargs, expected_status) tuple,
+        where kwargs are passed on to request(). Each request runs in its
+        own subTest, and only a RequestRecord of it is kept, with the
+        headers named in `batch_headers` and the number of queries made,
+        not the response. The assertion fails once, after every request
+        has been made, with a table of each unexpected status code.
+        Returns the records, in order.
+        """
+        records = []
+        failures = []
+        submitted = 0
+        for index, (method_name, url_name, kwargs, expected_status) in enumerate(items):
+            submitted += 1
+            with self.subTest(index=index, method=method_name, url_name=url_name):
+                with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+                    response = self.request(method_name, url_name, **kwargs)
+                headers = {name: response[name] for name in self.batch_headers if response.has_header(name)}
+                record = RequestRecord(
+                    method_name, response.wsgi_request.path, response.status_code, headers, len(queries)
+                )
+                records.append(record)
+                if record.status != expected_status:
+                    failures.append(
+                        (str(index), method_name, str(url_name), record.url, str(expected_status), str(record.status))
+                    )
+        if failures:
+            self.fail(
+                f"{len(failures)} of {submitted} requests did not return the expected status code:\n\n"
+                + format_rows(("#", "Method", "URL name", "Path", "Expected", "Got"), failures, left=4)
+            )
+        return records
 
     def get_check_200(self, url, *args, **kwargs):
         """Test that we can GET a page and it returns a 200"""
@@ -238,6 +939,184 @@ class BaseTestCase(StatusCodeAssertionMixin):
         expected_url = f"{login_url}?next={resolved_url}"
         self.assertRedirects(response, expected_url)
 
+    def assertAllLoginRequired(self, url_names=None, namespace=None, method="get", args_provider=None, exclude=None):
+        """
+        Ensure login is required to access every one of `url_names`, or every
+        named URL in `namespace`, via <method> (default GET)
+
+        URL names that need arguments get them from `args_provider`, as in
+        assertAllURLsGood(); names that cannot be reversed fail the assertion
+        unless `exclude`, glob patterns of names in `namespace`, leaves them
+        out. Every URL is requested with one anonymous client, and the
+        assertion fails once, listing each URL that did not redirect to
+        LOGIN_URL.
+        """
+        if (url_names is None) == (namespace is None):
+            raise ValueError("Pass either url_names or namespace to assertAllLoginRequired().")
+        if namespace is not None:
+            url_names = select_url_names(include=[f"{namespace}:*"], exclude=exclude)
+            if not url_names:
+                self.fail(f"No URL names to check in namespace {namespace!r}.")
+        elif not url_names:
+            self.fail("No URL names to check.")
+
+        urls = []
+        unreversed = []
+        for name in url_names:
+            url = reverse_url(name, args_provider)
+            if url is not None:
+                urls.append((name, url))
+            elif namespace is None and "/" in str(name):
+                # A plain URL
+                urls.append((name, name))
+            else:
+                unreversed.append(name)
+        if unreversed:
+            fix = "pass their arguments with args_provider"
+            if namespace is not None:
+                fix += " or leave them out with exclude"
+            self.fail(f"Cannot reverse {', '.join(map(str, unreversed))} without arguments; {fix}.")
+
+        login_url = str(resolve_url(settings.LOGIN_URL))
+        client = type(self.client)()
+        request = getattr(client, method.lower())
+        failures = []
+        for name, url in urls:
+            try:
+                response = request(url)
+            except Exception as e:  # noqa: BLE001 - report it with the other unprotected URLs
+                failures.append((name, url, type(e).__name__))
+                continue
+            location = response.get("Location", "")
+            if response.status_code not in _REDIRECT_STATUSES or _url_parts(location) != _url_parts(
+                login_url, next=url
+            ):
+                failures.append((name, url, f"{response.status_code} {location}".rstrip()))
+        if failures:
+            self.fail(
+                f"{len(failures)} of {len(urls)} URLs did not redirect to {login_url}:\n\n"
+                + format_rows(("URL name", "Path", "Response"), failures)
+            )
+
+    def assertPermissionMatrix(self, roles, expected, method="get", args_provider=None):
+        """
+        Ensure each role gets the expected status code from each URL.
+
+        `roles` maps a role name to a list of perms for make_user(), to an
+        existing user, or to None for an anonymous visitor. `expected` maps
+        each URL name, or plain URL, to a dict of the status code expected
+        for each role; roles left out of it are not checked for that URL.
+
+        Each role's user is made once per test and logged in once, with its
+        session from cache_login() when there is one, and then requests every
+        URL with its own client. The assertion fails once, with a table of
+        every mismatch. Returns the status codes received, keyed by
+        (role, URL name).
+        """
+        unknown = {role for statuses in expected.values() for role in statuses} - set(roles)
+        if unknown:
+            raise ValueError(f"Unknown roles in expected: {', '.join(sorted(map(str, unknown)))}")
+
+        clients = {role: self._role_client(role, user_or_perms) for role, user_or_perms in roles.items()}
+        statuses = {}
+        mismatches = []
+        for name, expected_statuses in expected.items():
+            url = reverse_url(name, args_provider) or name
+            for role, expected_status in expected_statuses.items():
+                try:
+                    status = getattr(clients[role], method.lower())(url).status_code
+                except Exception as e:  # noqa: BLE001 - report it with the other mismatches
+                    status = type(e).__name__
+                statuses[role, name] = status
+                if status != expected_status:
+                    mismatches.append((str(role), name, url, str(expected_status), str(status)))
+        if mismatches:
+            checked = sum(len(expected_statuses) for expected_statuses in expected.values())
+            self.fail(
+                f"{len(mismatches)} of {checked} requests did not get the expected status code:\n\n"
+                + format_rows(("Role", "URL name", "Path", "Expected", "Got"), mismatches)
+            )
+        return statuses
+
+    def _role_client(self, role, user_or_perms):
+        """Return a client logged in as the user for `role`, making the user if needed."""
+        client = type(self.client)()
+        if user_or_perms is None:
+            return client
+        if isinstance(user_or_perms, get_user_model()):
+            user = user_or_perms
+        else:
+            perms = tuple(user_or_perms)
+            role_users = self.__dict__.setdefault("_role_users", {})
+            if (role, perms) not in role_users:
+                role_users[role, perms] = self.make_user(f"role-{role}-{len(role_users)}", perms=perms)
+            user = role_users[role, perms]
+
+        session_key = self._cached_login_session(user)
+        if session_key is None:
+            client.force_login(user)
+        else:
+            client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+        return client
+
+    def assertRedirectChain(self, url_name, chain, *args, method="get", fetch_target=False, **kwargs):
+        """
+        Ensure requesting url_name redirects along `chain`, hop by hop.
+
+        Each entry of `chain` is the URL, or URL name, that hop redirects to,
+        or a (URL, status code) pair to check the status too. Only as many
+        redirects as `chain` has entries are followed, and the page at the
+        end is not requested unless `fetch_target` is True, in which case it
+        must not redirect again. Other arguments are those of request().
+        Expected URLs may be relative or absolute, like assertRedirects().
+        Returns the last response received.
+        """
+        if not chain:
+            raise ValueError("assertRedirectChain() needs at least one redirect in chain.")
+        data = kwargs.get("data", {})
+        lean = kwargs.get("lean", self.lean_responses)
+        # 307 and 308 hops replay the body, so they need its content type too
+        replay = dict(kwargs.get("extra", {}))
+        if kwargs.get("content_type") is not None:
+            replay["content_type"] = kwargs["content_type"]
+        response = self.request(method, url_name, *args, **kwargs)
+        path = response.wsgi_request.get_full_path()
+        host = response.wsgi_request.get_host()
+        hops = []
+        for number, entry in enumerate(chain, 1):
+            expected_url, expected_status = (entry, None) if isinstance(entry, str) else entry
+            expected_url = _local_url(urljoin(path, self._resolve_url(expected_url)), host)
+            if response.status_code not in _REDIRECT_STATUSES:
+                self.fail(
+                    f"Redirect {number} of {len(chain)}: expected a redirect from {path} to {expected_url}, "
+                    f"but got status {response.status_code}. Redirects so far: {hops}"
+                )
+            location = _local_url(urljoin(path, response["Location"]), host)
+            hops.append((location, response.status_code))
+            if _url_parts(location) != _url_parts(expected_url) or expected_status not in (None, response.status_code):
+                self.fail(
+                    f"Redirect {number} of {len(chain)} from {path}: expected {expected_url}"
+                    f"{f' ({expected_status})' if expected_status else ''}, got {location} ({response.status_code})"
+                )
+            if number == len(chain) and not fetch_target:
+                break
+            # Like the test client's follow=True, only 307 and 308 repeat the method and data
+            with _lean_template_capture() if lean else nullcontext():
+                if response.status_code in (307, 308):
+                    response = getattr(self.client, method)(location, data=data, **replay)
+                else:
+                    response = self.client.get(location)
+            path = response.wsgi_request.get_full_path()
+
+        if fetch_target and response.status_code in _REDIRECT_STATUSES:
+            self.fail(f"Expected the redirects to end at {path}, but it redirects to {response['Location']}.")
+        if lean and not response.streaming:
+            self.last_response = LeanResponse(response)
+        else:
+            self.last_response = response
+        self.context = self.last_response.context
+        return response
+
     assertRedirects = DjangoTestCase.assertRedirects
     assertURLEqual = assertURLEqual
 
@@ -245,6 +1124,62 @@ class BaseTestCase(StatusCodeAssertionMixin):
         """Login a user"""
         return login(self, *args, **credentials)
 
+    @classmethod
+    def json_payload(cls, data, name=None):
+        """
+        Return `data` encoded as JSON bytes, for request(data=...,
+        content_type="application/json").
+
+        With a `name`, the bytes are kept under that name until the end of
+        the test class, and later calls with the same name reuse them
+        without looking at `data`.
+        """
+        if name is None:
+            return json.dumps(data, cls=DjangoJSONEncoder).encode()
+        payloads = _payloads.setdefault(cls, {})
+        if name not in payloads:
+            payloads[name] = json.dumps(data, cls=DjangoJSONEncoder).encode()
+        return payloads[name]
+
+    @classmethod
+    def cache_login(cls, *users):
+        """
+        Create a login session for each of `users` up front.
+
+        Later login(user) calls then only set the session cookie on the
+        client, skipping authentication and the session write. Call this
+        from setUpTestData(), so the sessions live as long as the class's
+        test data. Sessions cached inside a test are forgotten after it.
+        """
+        sessions = _login_sessions.setdefault(cls, {})
+        client_class = getattr(cls, "client_class", Client)
+        for user in users:
+            # A fresh client each time, as force_login() reuses the session
+            client = client_class()
+            client.force_login(user)
+            sessions[user.pk] = (client.cookies[settings.SESSION_COOKIE_NAME].value, cls._in_class_setup)
+
+    def _cached_login_session(self, user):
+        """
+        Return the key of the session cache_login() made for `user`, or None
+        if there is none or it no longer logs that user in.
+        """
+        entry = _login_sessions.get(type(self), {}).get(user.pk)
+        if entry is None:
+            return None
+        session = import_module(settings.SESSION_ENGINE).SessionStore(entry[0])
+        if session.get(SESSION_KEY) != user._meta.pk.value_to_string(user) or not constant_time_compare(
+            session.get(HASH_SESSION_KEY, ""), user.get_session_auth_hash()
+        ):
+            return None
+        return entry[0]
+
+    def _forget_test_logins(self):
+        # Sessions cached inside the test went away with its data
+        sessions = _login_sessions.get(type(self), {})
+        for pk in [pk for pk, (_, for_class) in sessions.items() if not for_class]:
+            del sessions[pk]
+
     def reverse(self, name, *args, **kwargs):
         """Reverse a url, convenience to avoid having to import reverse in tests"""
         return reverse(name, args=args, kwargs=kwargs)
@@ -293,12 +1228,80 @@ class BaseTestCase(StatusCodeAssertionMixin):
         return test_user
 
     def assertNumQueriesLessThan(self, num, *args, **kwargs):
+        """
+        Assert that fewer than `num` queries run in the block or in a call to
+        `func`. `using` is a database alias, a list of them, or "__all__" for
+        every database the test case may query; the limit applies to the total.
+        """
         func = kwargs.pop("func", None)
         using = kwargs.pop("using", DEFAULT_DB_ALIAS)
         verbose = kwargs.pop("verbose", False)
-        conn = connections[using]
+        if using == "__all__":
+            databases = getattr(self, "databases", {DEFAULT_DB_ALIAS})
+            aliases = [alias for alias in connections if databases == "__all__" or alias in databases]
+        elif isinstance(using, str):
+            aliases = [using]
+        else:
+            aliases = list(using)
 
-        context = _AssertNumQueriesLessThanContext(self, num, conn, verbose=verbose)
+        context = _AssertNumQueriesLessThanContext(self, num, aliases, verbose=verbose)
+        if func is None:
+            return context
+
+        with context:
+            func(*args, **kwargs)
+
+    def assertTemplatesRenderedLessThan(self, num, *args, **kwargs):
+        """
+        Assert that fewer than `num` templates are rendered, counting every
+        include and inclusion tag, in the block or in a call to `func`.
+        """
+        func = kwargs.pop("func", None)
+        context = _AssertTemplatesContext(self, num=num)
+        if func is None:
+            return context
+
+        with context:
+            func(*args, **kwargs)
+
+    def assertTemplateRenderTimeLessThan(self, seconds, *args, **kwargs):
+        """
+        Assert that rendering templates takes less than `seconds` in total in
+        the block or in a call to `func`. Nested templates are not counted twice.
+        """
+        func = kwargs.pop("func", None)
+        context = _AssertTemplatesContext(self, seconds=seconds)
+        if func is None:
+            return context
+
+        with context:
+            func(*args, **kwargs)
+
+    def assertCacheHits(self, num=None, *args, **kwargs):
+        """
+        Assert that the cache is hit at least `num` times, and, if `ratio` is
+        given, that at least that share of cache reads are hits, in the block
+        or in a call to `func`. Counts every configured cache unless `using`
+        names one.
+        """
+        func = kwargs.pop("func", None)
+        context = _AssertCacheContext(
+            self, using=kwargs.pop("using", None), min_hits=num, min_ratio=kwargs.pop("ratio", None)
+        )
+        if func is None:
+            return context
+
+        with context:
+            func(*args, **kwargs)
+
+    def assertNoCacheMisses(self, *args, **kwargs):
+        """
+        Assert that no cache read misses, or no more than `max_misses` do, in
+        the block or in a call to `func`. Counts every configured cache
+        unless `using` names one.
+        """
+        func = kwargs.pop("func", None)
+        context = _AssertCacheContext(self, using=kwargs.pop("using", None), max_misses=kwargs.pop("max_misses", 0))
         if func is None:
             return context
 
@@ -309,26 +1312,135 @@ class BaseTestCase(StatusCodeAssertionMixin):
         """
         Quick-n-dirty testing of a given url name.
         Ensures URL returns a 200 status and that generates less than 50
-        database queries.
+        database queries. Takes the same `profile` argument as request();
+        with profile=True the request's phase breakdown is printed. Pass
+        `cache_budget` to also limit the number of cache misses, and `using`
+        to count queries on other databases, as in assertNumQueriesLessThan().
         """
         query_count = kwargs.pop("test_query_count", 50)
+        cache_budget = kwargs.pop("cache_budget", None)
+        using = kwargs.pop("using", DEFAULT_DB_ALIAS)
+        cache_context = nullcontext() if cache_budget is None else self.assertNoCacheMisses(max_misses=cache_budget)
 
-        with self.assertNumQueriesLessThan(query_count, verbose=verbose):
+        with cache_context, self.assertNumQueriesLessThan(query_count, using=using, verbose=verbose):
             response = self.get(url_name, *args, **kwargs)
 
         self.response_200(response)
+        if kwargs.get("profile") is True:
+            print(response.profile)
 
         return response
 
+    def assertAllURLsGood(
+        self, include=None, exclude=None, args_provider=None, test_query_count=50, workers=None, verbose=True
+    ):
+        """
+        Quick-n-dirty testing of every URL in ROOT_URLCONF.
+
+        GETs each named URL that can be reversed, with arguments from
+        `args_provider` where it needs them, and checks it the way
+        assertGoodView() does: a 200 status and less than `test_query_count`
+        queries. `include` and `exclude` are glob patterns for the URL names
+        to sweep. With `workers`, URLs are requested from that many threads.
+
+        Prints a table of every URL's status, query count and time, unless
+        `verbose` is False, and fails once, listing every URL that failed.
+        Returns the URLCheck results.
+        """
+        urls = sweep_urls(include=include, exclude=exclude, args_provider=args_provider)
+        checks = check_urls(self.client, urls, workers=workers)
+        if verbose:
+            print(format_table(checks))
+        failures = [check for check in checks if check.status != 200 or check.queries >= test_query_count]
+        if failures:
+            self.fail(
+                f"{len(failures)} of {len(checks)} URLs did not return a 200 "
+                f"with less than {test_query_count} queries:\n\n{format_table(failures)}"
+            )
+        return checks
+
+    def format_response_diff(self, text, response=None):
+        """
+        Describe where `text` is, or most nearly is, in the response content.
+
+        If `text` occurs in the response, the region around its first
+        occurrence is shown. Otherwise the closest matching region is located
+        and shown as a unified diff against `text`. Either way only about
+        `response_diff_context` characters either side of the region are
+        included, however large the response is.
+        """
+        response = self._which_response(response)
+        if response.streaming:
+            raise ValueError("format_response_diff() cannot read a streaming response.")
+        content = response.content.decode(response.charset or "utf-8", errors="replace")
+        if isinstance(text, bytes):
+            text = text.decode(response.charset or "utf-8", errors="replace")
+        text = str(text)
+        context = self.response_diff_context
+
+        anchor = content.find(text)
+        found = anchor != -1
+        if not found:
+            anchor = _find_anchor(text, content)
+        if anchor is None:
+            return (
+                f"No part of the text was found in the response ({len(content)} characters). "
+                f"The response starts with:\n{_response_excerpt(content, 0, 2 * context)}"
+            )
+
+        start = max(anchor - context, 0)
+        end = anchor + len(text) + context
+        # Trim to whole lines where the window allows it
+        newline = content.find("\n", start, anchor)
+        if start > 0 and newline != -1:
+            start = newline + 1
+        newline = content.rfind("\n", anchor + len(text), end)
+        if end < len(content) and newline != -1:
+            end = newline
+        line = content.count("\n", 0, anchor) + 1
+        if found:
+            return f"Found at line {line} of the response:\n{_response_excerpt(content, start, end)}"
+
+        diff = difflib.unified_diff(
+            text.splitlines(),
+            content[start:end].splitlines(),
+            fromfile="expected",
+            tofile=f"response, near line {line}",
+            lineterm="",
+        )
+        return f"Closest match in the response ({len(content)} characters):\n" + "\n".join(diff)
+
+    def _compact_contains_failure(self, error, text, response, status_code):
+        if response.status_code != status_code or response.streaming:
+            return error
+        # Keep Django's summary line, but not the full response it appends.
+        summary = str(error).split("\n", 1)[0].replace(" in the following response", " in the response")
+        return self.failureException(f"{summary}\n{self.format_response_diff(text, response)}")
+
     def assertResponseContains(self, text, response=None, html=True, **kwargs):
-        """Convenience wrapper for assertContains"""
+        """
+        Convenience wrapper for assertContains
+
+        On failure only the closest matching region of the response is shown,
+        see format_response_diff().
+        """
         response = self._which_response(response)
-        self.assertContains(response, text, html=html, **kwargs)
+        try:
+            self.assertContains(response, text, html=html, **kwargs)
+        except self.failureException as e:
+            raise self._compact_contains_failure(e, text, response, kwargs.get("status_code", 200)) from None
 
     def assertResponseNotContains(self, text, response=None, html=True, **kwargs):
-        """Convenience wrapper for assertNotContains"""
+        """
+        Convenience wrapper for assertNotContains
+
+        On failure only the region around the unexpected text is shown.
+        """
         response = self._which_response(response)
-        self.assertNotContains(response, text, html=html, **kwargs)
+        try:
+            self.assertNotContains(response, text, html=html, **kwargs)
+        except self.failureException as e:
+            raise self._compact_contains_failure(e, text, response, kwargs.get("status_code", 200)) from None
 
     def assertResponseTemplateUsed(self, template_name, response=None, **kwargs):
         """Convenience wrapper for assertTemplateUsed"""
@@ -358,6 +1470,8 @@ class BaseTestCase(StatusCodeAssertionMixin):
 
     def get_context(self, key):
         if self.last_response is not None:
+            if self.last_response.context is None:
+                self.fail(_LEAN_NO_CONTEXT)
             self.assertIn(key, self.last_response.context)
             return self.last_response.context[key]
         else:
@@ -380,6 +1494,8 @@ class BaseTestCase(StatusCodeAssertionMixin):
         :param ordered: If True, messages must match in order (default: True)
         """
         response = self._which_response(response)
+        if isinstance(response, LeanResponse):
+            self.fail(_LEAN_NO_CONTEXT)
         assertMessages(self, response, expected_messages, ordered=ordered)
 
 
@@ -394,6 +1510,109 @@ class TestCase(DjangoTestCase, BaseTestCase):
         self.last_response = None
         super().__init__(*args, **kwargs)
 
+    def tearDown(self):
+        self._release_responses()
+        self._forget_test_logins()
+        super().tearDown()
+
+    @classmethod
+    def setUpClass(cls):
+        cls._in_class_setup = True
+        try:
+            super().setUpClass()
+        finally:
+            cls._in_class_setup = False
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super().tearDownClass()
+        finally:
+            # The sessions were rolled back with the class's test data
+            _login_sessions.pop(cls, None)
+            _payloads.pop(cls, None)
+
+
+class TransactionTestCase(DjangoTransactionTestCase, BaseTestCase):
+    """
+    Django TransactionTestCase with helpful additional features
+
+    Instead of flushing every table after each test, only the tables the
+    test wrote to are emptied. Writes are tracked with an execute_wrapper on
+    each database connection in the test's thread. Django's full flush is
+    still used when a test wrote to a table that held rows beforehand (for
+    example content types), ran SQL that could not be classified, or uses
+    serialized_rollback.
+    """
+
+    user_factory = None
+
+    def __init__(self, *args, **kwargs):
+        self.last_response = None
+        super().__init__(*args, **kwargs)
+
+    def tearDown(self):
+        self._release_responses()
+        # Every test's data is flushed, so no cached session outlives it
+        self._forget_test_logins()
+        super().tearDown()
+
+    @classmethod
+    def setUpClass(cls):
+        cls._write_trackers = {}
+        cls._write_tracking = ExitStack()
+        for db_name in cls._databases_names(include_mirrors=False):
+            if db_name not in _table_states:
+                _table_states[db_name] = _TableState(db_name)
+            tracker = cls._write_trackers[db_name] = _WriteTracker()
+            cls._write_tracking.enter_context(connections[db_name].execute_wrapper(tracker))
+        try:
+            super().setUpClass()
+        except Exception:
+            cls._write_tracking.close()
+            raise
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super().tearDownClass()
+        finally:
+            cls._write_tracking.close()
+            _login_sessions.pop(cls, None)
+            _payloads.pop(cls, None)
+
+    def _tables_to_flush(self):
+        """Map each database to the tables to empty, or return None if a full flush is needed."""
+        if self.serialized_rollback:
+            return None
+        flush = {}
+        for db_name, tracker in self._write_trackers.items():
+            state = _table_states[db_name]
+            if tracker.unknown or not tracker.tables <= state.models.keys():
+                return None
+            tables = state.referencing_closure(tracker.tables)
+            if tables & state.seeded:
+                return None
+            flush[db_name] = tables
+        return flush
+
+    def _fixture_teardown(self):
+        try:
+            flush = self._tables_to_flush()
+            if flush is None:
+                return super()._fixture_teardown()
+            for db_name, tables in flush.items():
+                if not tables:
+                    continue
+                connection = connections[db_name]
+                sql_list = connection.ops.sql_flush(
+                    no_style(), sorted(tables), allow_cascade=self.available_apps is not None
+                )
+                connection.ops.execute_sql_flush(sql_list)
+        finally:
+            for tracker in self._write_trackers.values():
+                tracker.reset()
+
 
 class APITestCase(TestCase):
     def setUp(self):
@@ -408,7 +1627,8 @@ class CBVTestCase(TestCase):
     Directly calls class-based generic view methods,
     bypassing the Django test Client.
 
-    This process bypasses middleware invocation and URL resolvers.
+    This process bypasses URL resolvers, and middleware unless a subset of
+    settings.MIDDLEWARE is selected with the `middleware` attribute.
 
     Example usage:
 
@@ -427,6 +1647,71 @@ class CBVTestCase(TestCase):
                 self.assertTrue(result)
     """
 
+    request_factory_class = RequestFactory
+    middleware = None
+
+    @classmethod
+    def get_request_factory(cls):
+        """
+        Return the pooled request factory for this class.
+
+        A single factory instance is shared by every test using the same
+        `request_factory_class`.
+        """
+        return _pooled_request_factory(cls.request_factory_class)
+
+    @classmethod
+    def request_template(cls, method="get", path="/", **extra):
+        """
+        Build a RequestTemplate for `method` and `path`.
+
+        Build it once, for example in setUpTestData(), and pass it as the
+        `request` argument of get() or post(). Each call clones the
+        template's environ instead of building a new one:
+
+            template = self.request_template("post", "/items/")
+            self.post(MyView, request=template, data={"name": "x"})
+            self.post(MyView, request=template.build(user=user))
+        """
+        return RequestTemplate(cls.get_request_factory(), method, path, **extra)
+
+    def _build_request(self, method, request, data):
+        headers = None
+        if self.middleware is not None and self.client.cookies:
+            # Carry the client's cookies, so a session from login() applies.
+            cookies = "; ".join(sorted(f"{morsel.key}={morsel.coded_value}" for morsel in self.client.cookies.values()))
+            headers = {"Cookie": cookies}
+
+        if isinstance(request, RequestTemplate):
+            return request.build(data=data, headers=headers)
+        if request is None:
+            # Use a basic request
+            factory = self.get_request_factory()
+            if method == "trace":
+                return factory.trace("/", headers=headers)
+            if data is None and method not in ("get", "head", "post"):
+                # These take the body as-is, and would send the string "None"
+                data = ""
+            return getattr(factory, method)("/", data, headers=headers)
+        return request
+
+    def get_middleware_chain(self):
+        """
+        Return the cached middleware chain for the `middleware` attribute.
+
+        `middleware` lists a subset of settings.MIDDLEWARE. The chain runs in
+        the order the middleware appears in settings, and is built once and
+        shared by every test selecting the same middleware. Returns None when
+        `middleware` is None, meaning no middleware is invoked.
+        """
+        if self.middleware is None:
+            return None
+        selected = tuple(path for path in settings.MIDDLEWARE if path in self.middleware)
+        missing = [path for path in self.middleware if path not in selected]
+        if missing:
+            raise ImproperlyConfigured(f"CBVTestCase.middleware entries are not in settings.MIDDLEWARE: {missing!r}")
+        return _middleware_chain(selected)
+
     @staticmethod
     def get_instance(view_cls, *args, **kwargs):
         """
@@ -453,51 +1738,113 @@ class CBVTestCase(TestCase):
         instance.kwargs = kwargs
         return instance
 
+    def get_form(self, view_cls, *args, **kwargs):
+        """
+        Return the form a FormMixin view, such as a FormView or UpdateView,
+        builds for a request, without calling its handler, validating the
+        form or rendering a template. The request is a POST carrying `data`
+        unless a `request` is passed. Other arguments are those of
+        get_instance(), so use `initkwargs` to set `object` for an update
+        view:
+
+            form = self.get_form(MyFormView, data={"name": ""})
+            self.assertFormErrors(form, field="name", code="required")
+        """
+        data = kwargs.pop("data", None)
+        request = self._build_request("post", kwargs.pop("request", None), data)
+        instance = self.get_instance(view_cls, *args, request=request, **kwargs)
+        recorder.record_view(view_cls)
+        return instance.get_form()
+
+    def view_request(self, method, view_cls, *args, **kwargs):
+        """
+        Calls the view_cls method handling HTTP `method` after instantiating
+        view class. Renders view templates and sets context if appropriate.
+
+        The handler is looked up the way View.dispatch() does: HEAD falls back
+        to get(), and a method the view does not handle gets a 405 response.
+
+        Takes `lean` and honors `lean_responses` like BaseTestCase.request().
+        """
+        data = kwargs.pop("data", None)
+        lean = kwargs.pop("lean", self.lean_responses)
+        request = self._build_request(method, kwargs.pop("request", None), data)
+        instance = self.get_instance(view_cls, *args, request=request, **kwargs)
+        handler = getattr(instance, method, None)
+        if handler is None and method == "head":
+            handler = getattr(instance, "get", None)
+        if handler is None:
+            handler = instance.http_method_not_allowed
+        with _lean_template_capture() if lean else nullcontext():
+            response = self.get_response(instance.request, handler)
+        recorder.record_view(view_cls)
+        recorder.record_templates(response.templates)
+        if lean and not response.streaming:
+            self.last_response = LeanResponse(response)
+        else:
+            self.last_response = response
+        self.context = self.last_response.context
+        return response
+
     def get(self, view_cls, *args, **kwargs):
         """
         Calls view_cls.get() method after instantiating view class.
         Renders view templates and sets context if appropriate.
         """
-        data = kwargs.pop("data", None)
-        instance = self.get_instance(view_cls, *args, **kwargs)
-        if not instance.request:
-            # Use a basic request
-            instance.request = RequestFactory().get("/", data)
-        self.last_response = self.get_response(instance.request, instance.get)
-        self.context = self.last_response.context
-        return self.last_response
+        return self.view_request("get", view_cls, *args, **kwargs)
 
     def post(self, view_cls, *args, **kwargs):
         """
         Calls view_cls.post() method after instantiating view class.
         Renders view templates and sets context if appropriate.
         """
-        data = kwargs.pop("data", None)
-        if data is None:
-            data = {}
-        instance = self.get_instance(view_cls, *args, **kwargs)
-        if not instance.request:
-            # Use a basic request
-            instance.request = RequestFactory().post("/", data)
-        self.last_response = self.get_response(instance.request, instance.post)
-        self.context = self.last_response.context
-        return self.last_response
+        return self.view_request("post", view_cls, *args, **kwargs)
+
+    def put(self, view_cls, *args, **kwargs):
+        """Calls view_cls.put(), like get()."""
+        return self.view_request("put", view_cls, *args, **kwargs)
+
+    def patch(self, view_cls, *args, **kwargs):
+        """Calls view_cls.patch(), like get()."""
+        return self.view_request("patch", view_cls, *args, **kwargs)
+
+    def delete(self, view_cls, *args, **kwargs):
+        """Calls view_cls.delete(), like get()."""
+        return self.view_request("delete", view_cls, *args, **kwargs)
+
+    def head(self, view_cls, *args, **kwargs):
+        """Calls view_cls.head(), or view_cls.get() if it has no head(), like get()."""
+        return self.view_request("head", view_cls, *args, **kwargs)
+
+    def options(self, view_cls, *args, **kwargs):
+        """Calls view_cls.options(), like get()."""
+        return self.view_request("options", view_cls, *args, **kwargs)
+
+    def trace(self, view_cls, *args, **kwargs):
+        """Calls view_cls.trace(), like get()."""
+        return self.view_request("trace", view_cls, *args, **kwargs)
 
     def get_response(self, request, view_func):
         """
         Obtain response from view class method (typically get or post).
 
-        No middleware is invoked, but templates are rendered
-        and context saved if appropriate.
+        `async def` handlers are awaited, so async views work the same way as
+        sync ones. Only the middleware selected by the `middleware` attribute is
+        invoked. Templates are rendered and context saved if appropriate.
         """
         # Curry (using functools.partial) a data dictionary into
         # an instance of the template renderer callback function.
         data = {}
-        on_template_render = partial(store_rendered_templates, data)
+        # Looked up on the module so lean requests can swap it out
+        on_template_render = partial(client_module.store_rendered_templates, data)
         signal_uid = f"template-render-{id(request)}"
         signals.template_rendered.connect(on_template_render, dispatch_uid=signal_uid)
         try:
-            response = view_func(request)
+            chain = self.get_middleware_chain()
+            if chain is None:
+                response = _call_view(view_func, request)
+            else:
+                response = chain(request, view_func)
 
             if hasattr(response, "render") and callable(response.render):
                 response = response.render()
@@ -526,11 +1873,17 @@ class CBVTestCase(TestCase):
         """
         Quick-n-dirty testing of a given view.
         Ensures view returns a 200 status and that generates less than 50
-        database queries.
+        database queries. Takes the same `profile`, `cache_budget` and
+        `using` arguments as BaseTestCase.assertGoodView().
         """
         query_count = kwargs.pop("test_query_count", 50)
+        cache_budget = kwargs.pop("cache_budget", None)
+        using = kwargs.pop("using", DEFAULT_DB_ALIAS)
+        cache_context = nullcontext() if cache_budget is None else self.assertNoCacheMisses(max_misses=cache_budget)
 
-        with self.assertNumQueriesLessThan(query_count):
+        with cache_context, self.assertNumQueriesLessThan(query_count, using=using):
             response = super().get(url_name, *args, **kwargs)
         self.response_200(response)
+        if kwargs.get("profile") is True:
+            print(response.profile)
         return response
@@ -5,3 +5,20 @@ class Data(models.Model):
     """Simple model to test our query assertions"""
 
     name = models.CharField(max_length=50)
+
+
+class DataProxy(Data):
+    """Proxy of Data, sharing its table"""
+
+    class Meta:
+        proxy = True
+
+
+class DataReport(models.Model):
+    """Unmanaged model reading Data's table, as if it were a database view"""
+
+    name = models.CharField(max_length=50)
+
+    class Meta:
+        managed = False
+        db_table = "test_app_data"
@@ -1,5 +1,11 @@
+import os
+import pstats
+import subprocess
+import sys
+
 import pytest
 
+from test_plus import baselines, lockfile, profile_files, selection
 from test_plus.compat import DRF
 
 
@@ -22,3 +28,241 @@ def test_assert_in_context(tp):
     response = tp.get("view-context-with")
     assert "testvalue" in response.context
     tp.assertInContext("testvalue")
+
+
+def test_cache_login(tp, db):
+    user = tp.make_user("cached")
+    tp.cache_login(user)
+    with tp.login(user):
+        tp.get_check_200("view-needs-login")
+
+
+def test_json_payload_name_first(tp):
+    assert tp.json_payload({"a": 1}, name="payload") == b'{"a": 1}'
+
+
+def test_json_payload_name_reused(tp):
+    # Run after the test above, this must not get its bytes back
+    assert tp.json_payload({"a": 2}, name="payload") == b'{"a": 2}'
+
+
+def test_tp_forgets_class_state(db):
+    from test_plus.plugin import _test_case, _test_case_class
+    from test_plus.test import _login_sessions, _payloads
+
+    fixture = _test_case(client=None)
+    t = next(fixture)
+    t.json_payload({"a": 1}, name="payload")
+    t.cache_login(t.make_user("cached"))
+    for store in (_payloads, _login_sessions):
+        assert _test_case_class() in store
+    # Finish the fixture as pytest does after the test
+    next(fixture, None)
+    for store in (_payloads, _login_sessions):
+        assert _test_case_class() not in store
+
+
+def test_plugin_import_does_not_load_django():
+    code = "import sys, test_plus.plugin; print(sorted(m for m in sys.modules if m.startswith('django')))"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(profile_files.__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_submodules_reachable_from_package():
+    code = (
+        "import django, test_plus; django.setup(); "
+        "print(test_plus.test.TestCase.__name__, test_plus.status_codes.__name__, test_plus.compat.__name__)"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(profile_files.__file__)))
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "test_project.settings",
+        "PYTHONPATH": os.path.join(root, "test_project"),
+    }
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["TestCase", "test_plus.status_codes", "test_plus.compat"]
+
+
+@pytest.fixture
+def dependency_recorder(monkeypatch):
+    recorder = selection.DependencyRecorder()
+    recorder.enabled = True
+    recorder.current = "test_id"
+    monkeypatch.setattr("test_plus.test.recorder", recorder)
+    return recorder
+
+
+def test_record_dependencies(tp, dependency_recorder):
+    tp.get("view-contains")
+    entry = dependency_recorder.tests["test_id"]
+    assert entry["urls"] == {"view-contains"}
+    assert entry["views"] == {"test_app.views.view_contains"}
+    assert entry["templates"] == {"test.html"}
+    files = {os.path.basename(path) for path in entry["files"]}
+    assert files == {"views.py", "test.html"}
+
+
+def test_record_dependencies_decorated_view(tp, dependency_recorder):
+    tp.get("cbview-needs-login")
+    assert dependency_recorder.tests["test_id"]["views"] == {"test_app.views.CBLoginRequiredView"}
+
+
+def test_is_affected(tmp_path):
+    tests = {"t::a": {"files": ["app/views.py"]}, "t::b": {"files": ["app/other.py"]}}
+    changed = {str((tmp_path / "app" / "views.py").resolve())}
+    test_file = tmp_path / "test_x.py"
+    assert selection.is_affected("t::a", test_file, tests, changed, tmp_path)
+    assert not selection.is_affected("t::b", test_file, tests, changed, tmp_path)
+    # Unknown tests and tests whose own file changed always run
+    assert selection.is_affected("t::new", test_file, tests, changed, tmp_path)
+    changed.add(str(test_file.resolve()))
+    assert selection.is_affected("t::b", test_file, tests, changed, tmp_path)
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def test_changed_files(tmp_path):
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "views.py").write_text("")
+    _git(tmp_path, "add", "views.py")
+    _git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-qm", "initial")
+    (tmp_path / "views.py").write_text("# changed")
+    (tmp_path / "new_views.py").write_text("")
+    changed = selection.changed_files("HEAD", cwd=tmp_path)
+    assert {os.path.basename(path) for path in changed} == {"views.py", "new_views.py"}
+    with pytest.raises(selection.GitError, match="failed"):
+        selection.changed_files("no-such-ref", cwd=tmp_path)
+
+
+def test_unmapped_changes(tmp_path):
+    tests = {"t::a": {"files": ["app/views.py", "app/templates/a.html"]}}
+    test_file = tmp_path / "app" / "tests.py"
+    changed = {str((tmp_path / "app" / name).resolve()) for name in ("views.py", "tests.py", "b.html")}
+    assert selection.unmapped_changes(changed, tests, {test_file}, tmp_path) == []
+    models = str((tmp_path / "app" / "models.py").resolve())
+    assert selection.unmapped_changes(changed | {models}, tests, {test_file}, tmp_path) == [models]
+
+
+def test_lockfile_merge_workers_keeps_other_files(tmp_path):
+    path = tmp_path / "deps.json"
+    selection.map_file.write(f"{path}.gw0", {"t::a": {"files": []}})
+    (tmp_path / "deps.json.bak").write_text("{}")
+    assert selection.map_file.merge_workers(path) == {"t::a": {"files": []}}
+    assert sorted(os.listdir(tmp_path)) == ["deps.json.bak"]
+
+
+def test_lockfile_ignores_other_versions(tmp_path):
+    path = tmp_path / "deps.json"
+    lockfile.Lockfile(2).write(path, {"t::a": {"files": []}})
+    assert lockfile.Lockfile(1).load(path) == {}
+    assert lockfile.Lockfile(2).load(path) == {"t::a": {"files": []}}
+    assert lockfile.Lockfile(1).load(tmp_path / "missing.json") == {}
+
+
+@pytest.fixture
+def profile_dumper(monkeypatch, tmp_path):
+    dumper = profile_files.ProfileDumper()
+    dumper.directory = str(tmp_path)
+    dumper.current = "tests/test_x.py::test_view"
+    monkeypatch.setattr("test_plus.test.dumper", dumper)
+    return dumper
+
+
+def test_profile_cprofile(tp, profile_dumper):
+    tp.get("view-contains", profile="cprofile")
+    tp.get("view-contains", profile="cprofile")
+    names = [os.path.basename(path) for path in profile_dumper.written]
+    assert names == [
+        "tests_test_x.py_test_view--view-contains.prof",
+        "tests_test_x.py_test_view--view-contains-2.prof",
+    ]
+    stats = pstats.Stats(profile_dumper.written[0])
+    assert any(func[2] == "view_contains" for func in stats.stats)
+
+
+def test_profile_pyinstrument(tp, profile_dumper):
+    pytest.importorskip("pyinstrument")
+    tp.get("view-contains", profile="pyinstrument")
+    (path,) = profile_dumper.written
+    assert path.endswith("--view-contains.folded")
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_profile_selected_test(tp, profile_dumper):
+    profile_dumper.profiler = "cprofile"
+    tp.get("view-200")
+    tp.get("view-200", profile=False)
+    assert len(profile_dumper.written) == 1
+
+
+def test_profile_unknown_profiler(tp, profile_dumper):
+    with pytest.raises(ValueError):
+        tp.get("view-200", profile="yappi")
+
+
+@pytest.fixture
+def query_baselines(monkeypatch):
+    query_baselines = baselines.QueryBaselines()
+    query_baselines.enabled = True
+    query_baselines.start_test("test_id")
+    monkeypatch.setattr("test_plus.test.baselines", query_baselines)
+    return query_baselines
+
+
+def test_query_baselines_recorded(tp, db, query_baselines):
+    tp.assertGoodView("view-data-5")
+    tp.assertGoodView("view-data-5")
+    with tp.assertNumQueriesLessThan(10):
+        tp.get("view-data-1")
+        tp.get("view-data-5")
+    with tp.assertNumQueriesLessThan(1):
+        pass
+    entries = query_baselines.recorded["test_id"]
+    assert {key: entry["queries"] for key, entry in entries.items()} == {
+        "view-data-5": 5,
+        "view-data-5 #2": 5,
+        "view-data-1,view-data-5": 6,
+        "block": 0,
+    }
+    assert entries["view-data-5"]["db_time_ms"] >= 0
+
+
+def test_query_baselines_fail_on_growth(tp, db, query_baselines):
+    query_baselines.stored = {"test_id": {"view-data-5": {"queries": 4, "db_time_ms": 1.0}}}
+    with pytest.raises(AssertionError, match="5 queries executed for 'view-data-5', more than the baseline of 4"):
+        tp.assertGoodView("view-data-5")
+    # Fewer queries than the baseline pass
+    query_baselines.stored["test_id"]["view-data-5"]["queries"] = 6
+    query_baselines.start_test("test_id")
+    tp.assertGoodView("view-data-5")
+    # Updating accepts the increase
+    query_baselines.stored["test_id"]["view-data-5"]["queries"] = 4
+    query_baselines.update = True
+    query_baselines.start_test("test_id")
+    tp.assertGoodView("view-data-5")
+
+
+def test_query_baselines_merge(tmp_path):
+    query_baselines = baselines.QueryBaselines()
+    query_baselines.stored = {"t::a": {"x": {"queries": 1}}, "t::b": {"x": {"queries": 2}}}
+    path = tmp_path / "query_baselines.json"
+    baselines.baselines_file.write(f"{path}.gw0", {"t::a": {"x": {"queries": 3}, "y": {"queries": 4}}})
+    recorded = baselines.baselines_file.merge_workers(path)
+    assert not list(tmp_path.iterdir())
+    # New entries are added, existing ones kept
+    assert query_baselines.merged(recorded) == {
+        "t::a": {"x": {"queries": 1}, "y": {"queries": 4}},
+        "t::b": {"x": {"queries": 2}},
+    }
+    query_baselines.update = True
+    assert query_baselines.merged(recorded) == {
+        "t::a": {"x": {"queries": 3}, "y": {"queries": 4}},
+        "t::b": {"x": {"queries": 2}},
+    }
+    baselines.baselines_file.write(path, recorded)
+    assert baselines.baselines_file.load(path) == recorded
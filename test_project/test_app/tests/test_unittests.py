@@ -1,15 +1,23 @@
 import json
 import re
+import runpy
 import sys
 import unittest
 import uuid
 from contextlib import contextmanager
+from pathlib import Path
 
 import django
 import factory.django
 import pytest
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.exceptions import ImproperlyConfigured
+from django.contrib.sessions.models import Session
+from django.core.cache import cache, caches
+from django.core.exceptions import NON_FIELD_ERRORS, ImproperlyConfigured
+from django.db import connections
+from django.http import HttpResponse
+from django.test import Client, override_settings
 from django.urls import NoReverseMatch
 
 try:
@@ -28,17 +36,29 @@ except ImportError:
 from test_app.forms import NameForm
 from test_app.models import Data
 from test_app.views import (
+    CBAsyncView,
     CBDataView,
     CBTemplateView,
+    CBUserView,
+    CBVerbView,
     CBView,
+    FormErrors,
+    view_contains,
 )
 
-from test_plus.compat import DRF
+from test_plus.compat import DRF, get_api_client
+from test_plus.profiling import InstrumentedClient
+from test_plus.sweep import url_names
 from test_plus.test import (
     APITestCase,
     CBVTestCase,
+    LeanResponse,
     NoPreviousResponse,
     TestCase,
+    TransactionTestCase,
+    _login_sessions,
+    _payloads,
+    _TableState,
 )
 
 User = get_user_model()
@@ -53,6 +73,24 @@ def redirect_stdout(new_target):
         sys.stdout = old_target
 
 
+def run_tests(test_class):
+    """Run the tests of `test_class` on their own, apart from this run, and return the unittest result."""
+    result = unittest.TestResult()
+    unittest.defaultTestLoader.loadTestsFromTestCase(test_class).run(result)
+    return result
+
+
+def assert_tests_pass(testcase, test_class):
+    result = run_tests(test_class)
+    testcase.assertTrue(result.wasSuccessful(), result.failures + result.errors)
+
+
+def assert_class_state_cleared(testcase, test_class, store):
+    """Run `test_class`, which must pass, and check that it left no entry in the module-level `store`."""
+    assert_tests_pass(testcase, test_class)
+    testcase.assertNotIn(test_class, store)
+
+
 class UserFactory(factory.django.DjangoModelFactory):
     username = factory.Sequence(lambda n: f"user{n}")
     email = factory.Sequence(lambda n: f"user{n}@example.com")
@@ -81,6 +119,91 @@ class TestMakeUser(TestCase):
         self.assertEqual(u1.email, "testuser@example.com")
 
 
+class TestPlusCachedLogin(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.make_user("cached")
+        cls.other = cls.make_user("other")
+        cls.cache_login(cls.user)
+
+    def test_login_uses_cached_session(self):
+        # Only the session is read, to check it still logs the user in
+        with self.assertNumQueries(1), self.login(self.user):
+            pass
+        with self.login(self.user):
+            self.get_check_200("view-needs-login")
+            self.assertEqual(self.last_response.wsgi_request.user, self.user)
+        # Logging out only dropped the cookie, so the session can be reused
+        self.assertLoginRequired("view-needs-login")
+        with self.login(self.user):
+            self.get_check_200("view-needs-login")
+
+    def test_explicit_credentials_are_checked(self):
+        with self.assertRaisesRegex(AssertionError, "login failed"):
+            self.login(self.user, password="wrong")
+        with self.login(self.user, password="password"):
+            self.get_check_200("view-needs-login")
+
+    def test_sessions_cleared_after_class(self):
+        class CachedLoginTests(TestCase):
+            @classmethod
+            def setUpTestData(cls):
+                cls.cache_login(cls.make_user("inner"))
+
+            def test_cached(self):
+                self.assertEqual(len(_login_sessions[type(self)]), 1)
+
+        assert_class_state_cleared(self, CachedLoginTests, _login_sessions)
+
+    def test_ended_session_falls_back_to_login(self):
+        Session.objects.all().delete()
+        with self.login(self.user):
+            self.get_check_200("view-needs-login")
+            self.assertEqual(self.last_response.wsgi_request.user, self.user)
+
+    def test_session_of_another_user_is_not_used(self):
+        sessions = _login_sessions[type(self)]
+        sessions[self.other.pk] = sessions[self.user.pk]
+        self.addCleanup(sessions.pop, self.other.pk)
+        with self.login(self.other):
+            self.get_check_200("view-needs-login")
+            self.assertEqual(self.last_response.wsgi_request.user, self.other)
+
+    def test_sessions_cached_in_a_test_are_forgotten(self):
+        class CachedInTestTests(TestCase):
+            def test_1_cache(self):
+                user = self.make_user("inner")
+                self.cache_login(user)
+                with self.login(user):
+                    self.get_check_200("view-needs-login")
+
+            def test_2_same_pk(self):
+                # The user gets the pk the rolled back one had
+                user = self.make_user("inner")
+                with self.login(user):
+                    self.get_check_200("view-needs-login")
+                    self.assertEqual(self.last_response.wsgi_request.user, user)
+
+        assert_tests_pass(self, CachedInTestTests)
+
+    def test_uncached_user_logs_in_normally(self):
+        with self.login(self.other):
+            self.get_check_200("view-needs-login")
+            self.assertEqual(self.last_response.wsgi_request.user, self.other)
+
+
+class TestPlusTearDown(TestCase):
+    def test_does_not_log_out(self):
+        # Django gives each test a new client and rolls back the session rows
+        logouts = []
+        self.client.logout = lambda: logouts.append(True)
+        self.client.force_login(self.make_user())
+        self.get("view-200")
+        self.tearDown()
+        self.assertEqual(logouts, [])
+        self.assertIsNone(self.last_response)
+
+
 class TestPlusViewTests(TestCase):
     def test_get(self):
         res = self.get("view-200")
@@ -115,6 +238,37 @@ class TestPlusViewTests(TestCase):
         output = output.getvalue().strip()
         self.assertTrue("This field is required." in output)
 
+    def test_assert_form_valid(self):
+        self.assertFormValid(NameForm(data={"name": "revsys"}))
+        with self.assertRaisesRegex(
+            AssertionError, r"not valid:\n\* name\n  \* This field is required. \(code='required'\)"
+        ):
+            self.assertFormValid(NameForm(data={}))
+        with self.assertRaisesRegex(AssertionError, "not bound"):
+            self.assertFormValid(NameForm())
+
+        self.post("form-errors")
+        with self.assertRaises(AssertionError):
+            self.assertFormValid()
+
+    def test_assert_form_errors(self):
+        form = NameForm(data={"name": "x" * 300})
+        self.assertFormErrors(form)
+        self.assertFormErrors(form, field="name")
+        self.assertFormErrors(form, code="max_length")
+        self.assertFormErrors(form, field="name", code="max_length")
+        with self.assertRaisesRegex(
+            AssertionError, r"Expected an error with code 'required' on 'name', but the form's"
+        ):
+            self.assertFormErrors(form, field="name", code="required")
+        with self.assertRaisesRegex(AssertionError, "Expected errors on '__all__'"):
+            self.assertFormErrors(form, field=NON_FIELD_ERRORS)
+        with self.assertRaisesRegex(AssertionError, "but the form is valid"):
+            self.assertFormErrors(NameForm(data={"name": "revsys"}))
+
+        self.post("form-errors")
+        self.assertFormErrors(field="name", code="required")
+
     def test_get_follow(self):
         # Expect 302 status code
         res = self.get("view-redirect")
@@ -266,6 +420,37 @@ class TestPlusViewTests(TestCase):
                 # without response
                 self._test_http_response(method, url=res_url)
 
+    def test_status_code_stub_is_current(self):
+        from test_plus.status_codes import StatusCodeAssertionMixin
+
+        script = Path(__file__).resolve().parents[3] / "scripts" / "generate_status_code_stub.py"
+        generator = runpy.run_path(str(script))
+        self.assertEqual(generator["STUB_PATH"].read_text(), generator["render_stub"]())
+        method = StatusCodeAssertionMixin.assert_http_404_not_found
+        self.assertEqual(method.__name__, "assert_http_404_not_found")
+        self.assertEqual(method.__doc__, "Server cannot find the requested resource.")
+
+    def test_response_methods(self):
+        self.get("view-404")
+        self.response_404()
+        with self.assertRaisesRegex(AssertionError, "404 != 200 : custom"):
+            self.response_200(msg="custom")
+
+    def test_assert_status_codes(self):
+        responses = [self.get("view-200"), self.get("view-201"), self.get("view-404")]
+        self.assertStatusCodes(responses[:1])
+        self.assertStatusCodes(
+            {"a": responses[0], "b": responses[1], "c": responses[2]}, status_code={"a": 200, "b": 201, "c": 404}
+        )
+        with self.assertRaises(AssertionError) as cm:
+            self.assertStatusCodes(responses, msg="sweep")
+        self.assertEqual(
+            str(cm.exception),
+            "2 of 3 responses had an unexpected status code:\n\n"
+            "/view/201/: 201, expected 200\n"
+            "/view/404/: 404, expected 200 : sweep",
+        )
+
     def test_get_check_200(self):
         res = self.get_check_200("view-200")
         self.assertTrue(res.status_code, 200)
@@ -460,6 +645,76 @@ class TestPlusViewTests(TestCase):
         with self.assertNumQueriesLessThan(6):
             self.get("view-data-5")
 
+    def test_assert_templates_rendered(self):
+        with self.assertTemplatesRenderedLessThan(5):
+            self.get("view-includes")
+
+    def test_assert_templates_rendered_failure(self):
+        with self.assertRaises(AssertionError) as cm, self.assertTemplatesRenderedLessThan(4):
+            self.get("view-includes")
+        message = str(cm.exception)
+        self.assertIn("4 templates rendered, expected less than 4", message)
+        self.assertIn("     3  other.html\n     1  includes.html", message)
+
+    def test_assert_templates_rendered_func(self):
+        self.assertTemplatesRenderedLessThan(2, "view-contains", func=self.get)
+
+    def test_assert_template_render_time(self):
+        with self.assertTemplateRenderTimeLessThan(10):
+            self.get("view-includes")
+
+    def test_assert_template_render_time_failure(self):
+        with self.assertRaises(AssertionError) as cm, self.assertTemplateRenderTimeLessThan(0):
+            self.get("view-includes")
+        self.assertIn("Rendering 4 templates took", str(cm.exception))
+        self.assertIn("other.html", str(cm.exception))
+
+    def test_assert_cache_hits(self):
+        cache.clear()
+        with self.assertCacheHits(0, ratio=0) as stats:
+            self.get("view-cached")
+        self.assertEqual((stats.gets, stats.hits, stats.misses, stats.sets), (1, 0, 1, 1))
+        self.assertEqual(stats.hit_ratio, 0)
+        with self.assertCacheHits(1, ratio=1):
+            self.get("view-cached")
+
+    def test_assert_cache_hits_failure(self):
+        cache.clear()
+        with self.assertRaises(AssertionError) as cm, self.assertCacheHits(ratio=0.5):
+            self.get("view-cached")
+        message = str(cm.exception)
+        self.assertIn("Cache hit ratio was 0%, expected at least 50%", message)
+        self.assertIn("default: 1 gets (0 hits, 1 misses), 1 sets, 0 deletes", message)
+        self.assertIn("Missed keys were:\n\ngreeting", message)
+
+    def test_assert_no_cache_misses(self):
+        cache.set("greeting", "Hello")
+        self.assertNoCacheMisses("view-cached", func=self.get)
+        cache.clear()
+        with self.assertRaisesRegex(AssertionError, "1 cache misses, expected at most 0"):
+            self.assertNoCacheMisses("view-cached", func=self.get)
+        with self.assertNoCacheMisses(max_misses=1, using="default"):
+            cache.delete("greeting")
+            self.get("view-cached")
+
+    def test_cache_counts_each_key_once(self):
+        cache.set_many({"a": 1, "b": 2})
+        with self.assertCacheHits(2) as stats:
+            cache.get_many(["a", "b", "c"])
+            cache.get_or_set("d", 4)
+            cache.delete_many(["a", "b"])
+        self.assertEqual((stats.gets, stats.hits, stats.misses), (5, 3, 2))
+        self.assertEqual((stats.sets, stats.deletes), (1, 2))
+        # The backend is left as it was
+        self.assertNotIn("get", vars(caches["default"]))
+
+    def test_assert_good_view_cache_budget(self):
+        cache.clear()
+        self.assertGoodView("view-cached", cache_budget=1)
+        with self.assertRaisesRegex(AssertionError, "1 cache misses, expected at most 0"):
+            cache.clear()
+            self.assertGoodView("view-cached", cache_budget=0)
+
     def test_invalid_request_method(self):
         with self.assertRaises(LookupError):
             self.request("foobar", "some-url")
@@ -534,6 +789,35 @@ class TestPlusViewTests(TestCase):
         self.assertResponseContains("<p>Hello world</p>")
         self.assertResponseNotContains("<p>Hello Frank</p>")
 
+    def test_assertresponsecontains_compact_failure(self):
+        response = HttpResponse("<div>filler</div>\n" * 50000 + "<p>Hello wrold</p>\n" + "<div>more</div>\n" * 100)
+        with self.assertRaises(AssertionError) as cm:
+            self.assertResponseContains("<p>Hello world</p>", response, html=False)
+        msg = str(cm.exception)
+        self.assertLess(len(msg), 2000)
+        self.assertIn("near line 50001", msg)
+        self.assertIn("-<p>Hello world</p>", msg)
+        self.assertIn("+<p>Hello wrold</p>", msg)
+
+    def test_assertresponsenotcontains_compact_failure(self):
+        response = HttpResponse("<div>filler</div>\n" * 50000 + "<p>Hello world</p>")
+        with self.assertRaises(AssertionError) as cm:
+            self.assertResponseNotContains("<p>Hello world</p>", response, html=False)
+        msg = str(cm.exception)
+        self.assertLess(len(msg), 2000)
+        self.assertIn("Found at line 50001", msg)
+
+    def test_format_response_diff_no_match(self):
+        response = HttpResponse("a" * 10000)
+        msg = self.format_response_diff("<p>Hello world</p>", response)
+        self.assertIn("No part of the text was found", msg)
+        self.assertLess(len(msg), 1000)
+
+    def test_assertresponsecontains_status_failure(self):
+        self.get("view-404")
+        with self.assertRaisesRegex(AssertionError, "Response code was 404"):
+            self.assertResponseContains("anything")
+
     def test_assertresponsetemplateused(self):
         self.get("view-contains")
         self.assertResponseTemplateUsed("test.html")
@@ -580,6 +864,527 @@ class TestPlusViewTests(TestCase):
             self.assertResponseMessages([])
 
 
+PAYLOAD = {"order": {"id": uuid.UUID("12345678-1234-5678-1234-567812345678"), "lines": list(range(50))}}
+
+
+class TestPlusPayloads(TestCase):
+    def test_pre_encoded_body(self):
+        body = json.dumps({"testing": True}).encode()
+        response = self.post("view-json", data=body, content_type="application/json")
+        self.assertEqual(json.loads(response.content), {"testing": True})
+        self.put("view-json", data=body, extra={"content_type": "application/json"})
+        self.response_200()
+
+    def test_bytes_need_content_type(self):
+        with self.assertRaises(ValueError):
+            self.post("view-json", data=b"{}")
+
+    def test_json_payload(self):
+        body = self.json_payload(PAYLOAD, name="order")
+        self.assertIs(self.json_payload(PAYLOAD, name="order"), body)
+        response = self.post("view-json", data=body, content_type="application/json")
+        self.assertEqual(json.loads(response.content)["order"]["id"], "12345678-1234-5678-1234-567812345678")
+
+    def test_json_payload_without_name(self):
+        cached = dict(_payloads.get(type(self), {}))
+        self.assertEqual(self.json_payload({"a": 1}), b'{"a": 1}')
+        self.assertEqual(self.json_payload({"a": 2}), b'{"a": 2}')
+        self.assertEqual(_payloads.get(type(self), {}), cached)
+
+    def test_json_payloads_cleared_after_class(self):
+        class PayloadTests(TestCase):
+            def test_payload(self):
+                self.json_payload(PAYLOAD, name="order")
+                self.assertIn(type(self), _payloads)
+
+        assert_class_state_cleared(self, PayloadTests, _payloads)
+
+
+class TestPlusRequestBatch(TestCase):
+    def test_batch(self):
+        records = self.request_batch(
+            [
+                ("get", "view-200", {}, 200),
+                ("post", "view-json", {"data": b"{}", "content_type": "application/json"}, 200),
+                ("get", "view-redirect", {}, 302),
+                ("get", "view-data-5", {}, 200),
+            ]
+        )
+        self.assertEqual([record.status for record in records], [200, 200, 302, 200])
+        self.assertEqual(records[1].headers, {"Content-Type": "application/json"})
+        self.assertEqual(records[2].headers["Location"], "/view/200/")
+        self.assertEqual(records[3].queries, 5)
+        self.assertEqual(records[3].url, "/view/data5/")
+
+    def test_reports_every_failure(self):
+        with self.assertRaises(AssertionError) as cm:
+            self.request_batch(
+                [
+                    ("get", "view-404", {}, 200),
+                    ("get", "view-200", {}, 200),
+                    ("post", "form-errors", {"data": {}}, 302),
+                ]
+            )
+        message = str(cm.exception)
+        self.assertIn("2 of 3 requests did not return the expected status code", message)
+        self.assertRegex(message, r"0 +get +view-404 +/view/404/ +200 +404\n")
+        self.assertRegex(message, r"2 +post +form-errors +/view/form-errors/ +302 +200")
+
+    def test_counts_requests_that_raised(self):
+        class BatchTests(TestCase):
+            def test_batch(self):
+                self.request_batch([("get", "view-bad-reverse", {}, 200), ("get", "view-404", {}, 200)])
+
+        result = run_tests(BatchTests)
+        self.assertIn("NoReverseMatch", result.errors[0][1])
+        self.assertIn("1 of 2 requests did not return", result.failures[0][1])
+
+
+class TestPlusLeanResponses(TestCase):
+    lean_responses = True
+
+    def test_lean_last_response(self):
+        response = self.get("view-context-with")
+        self.assertIsNone(response.context)
+        self.assertIsInstance(self.last_response, LeanResponse)
+        self.assertIsNone(self.context)
+        self.response_200()
+        self.assertResponseTemplateUsed("base.html")
+        self.assertResponseHeaders({"Content-Type": "text/html; charset=utf-8"})
+        with self.assertRaisesRegex(AssertionError, "no template context"):
+            self.get_context("testvalue")
+        self.get("view-contains")
+        self.assertResponseContains("<p>Hello world</p>")
+        self.assertEqual(self.last_response.text, "<p>Hello world</p>\n")
+
+    def test_json_and_redirect(self):
+        self.post("view-json", data=b'{"a": 1}', content_type="application/json")
+        self.assertEqual(self.last_response.json(), {"a": 1})
+        self.get("view-redirect")
+        self.response_302()
+        self.assertEqual(self.last_response.url, "/view/200/")
+
+    def test_context_when_asked_for(self):
+        self.get("view-context-with", lean=False)
+        self.assertInContext("testvalue")
+
+    def test_released_in_teardown(self):
+        self.get("view-200")
+        self.tearDown()
+        self.assertIsNone(self.last_response)
+        self.assertIsNone(self.context)
+
+    def test_form_and_message_assertions_need_context(self):
+        self.post("form-errors", data={})
+        for assertion in (self.assertFormErrors, self.assertFormValid, self.print_form_errors):
+            with self.subTest(assertion.__name__), self.assertRaisesRegex(AssertionError, "pass lean=False"):
+                assertion()
+        self.get("view-with-messages")
+        with self.assertRaisesRegex(AssertionError, "pass lean=False"):
+            self.assertResponseMessages([])
+
+
+class TestPlusCBVLeanResponses(CBVTestCase):
+    lean_responses = True
+
+    def test_lean_view_request(self):
+        response = self.get(CBTemplateView)
+        self.assertIsNone(response.context)
+        self.assertIsInstance(self.last_response, LeanResponse)
+        self.assertResponseTemplateUsed("test.html")
+        with self.assertRaisesRegex(AssertionError, "no template context"):
+            self.get_context("revsys")
+        self.get(CBTemplateView, lean=False)
+        self.assertContext("revsys", 42)
+
+
+class TestPlusRedirectChain(TestCase):
+    def test_chain(self):
+        with self.assertTemplatesRenderedLessThan(1):
+            response = self.assertRedirectChain(
+                "view-redirect-chain", [("/view/redirect/?from=chain", 301), ("view-200", 302)]
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertIs(self.last_response, response)
+
+    def test_stops_at_chain_depth(self):
+        response = self.assertRedirectChain("view-redirect-chain", ["/view/redirect/?from=chain"])
+        self.assertEqual(response.status_code, 301)
+
+    def test_fetch_target(self):
+        response = self.assertRedirectChain("view-redirect", ["/view/200/"], fetch_target=True)
+        self.assertEqual(response.status_code, 200)
+        with self.assertRaisesRegex(AssertionError, "to end at /view/redirect/\\?from=chain, but it redirects"):
+            self.assertRedirectChain("view-redirect-chain", ["/view/redirect/?from=chain"], fetch_target=True)
+
+    def test_wrong_hop(self):
+        with self.assertRaisesRegex(
+            AssertionError,
+            r"Redirect 2 of 2 from /view/redirect/\?from=chain: expected /view/404/, got /view/200/ \(302\)",
+        ):
+            self.assertRedirectChain("view-redirect-chain", ["/view/redirect/?from=chain", "view-404"])
+        with self.assertRaisesRegex(AssertionError, r"expected /view/redirect/\?from=chain \(302\), got"):
+            self.assertRedirectChain("view-redirect-chain", [("/view/redirect/?from=chain", 302)])
+
+    def test_absolute_urls(self):
+        self.assertRedirectChain("view-redirect", ["http://testserver/view/200/"])
+        with self.assertRaisesRegex(AssertionError, "expected http://example.com/view/200/"):
+            self.assertRedirectChain("view-redirect", ["http://example.com/view/200/"])
+
+    def test_307_replays_body_and_content_type(self):
+        response = self.assertRedirectChain(
+            "view-redirect-307",
+            [("view-json", 307)],
+            method="post",
+            data=b'{"a": 1}',
+            content_type="application/json",
+            fetch_target=True,
+        )
+        self.assertEqual(response.json(), {"a": 1})
+        response = self.assertRedirectChain(
+            "view-redirect-307",
+            ["view-json"],
+            method="post",
+            data=b'{"a": 2}',
+            extra={"content_type": "application/json"},
+            fetch_target=True,
+        )
+        self.assertEqual(response.json(), {"a": 2})
+
+    def test_lean(self):
+        self.assertRedirectChain("view-redirect", ["view-200"], fetch_target=True, lean=True)
+        self.assertIsInstance(self.last_response, LeanResponse)
+
+    def test_too_short(self):
+        with self.assertRaisesRegex(AssertionError, "Redirect 2 of 2: expected a redirect from /view/200/"):
+            self.assertRedirectChain("view-redirect", ["view-200", "view-201"])
+        with self.assertRaises(ValueError):
+            self.assertRedirectChain("view-redirect", [])
+
+
+class TestPlusURLSweep(TestCase):
+    def test_all_urls_good(self):
+        with redirect_stdout(StringIO()) as stdout:
+            checks = self.assertAllURLsGood(include=["view-200", "view-data-*"])
+        self.assertEqual([check.name for check in checks], ["view-200", "view-data-1", "view-data-5"])
+        self.assertEqual([check.queries for check in checks], [0, 1, 5])
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(lines[0].split(), ["URL", "name", "Path", "Status", "Queries", "ms"])
+        self.assertEqual(lines[3].split()[:4], ["view-data-5", "/view/data5/", "200", "5"])
+
+    def test_all_urls_good_reports_every_failure(self):
+        with self.assertRaises(AssertionError) as cm:
+            self.assertAllURLsGood(include=["view-2*", "view-404", "view-data-5"], test_query_count=5, verbose=False)
+        message = str(cm.exception)
+        self.assertIn("4 of 5 URLs did not return a 200 with less than 5 queries", message)
+        for name in ("view-201", "view-204", "view-404", "view-data-5"):
+            self.assertIn(name, message)
+        self.assertNotIn("view-200", message)
+
+    def test_args_provider(self):
+        checks = self.assertAllURLsGood(
+            include=["status-code-view"], args_provider={"status-code-view": {"status": 200}}, verbose=False
+        )
+        self.assertEqual([check.url for check in checks], ["/status-code-view/200/"])
+        checks = self.assertAllURLsGood(include=["status-code-view"], args_provider=lambda name: ["200"], verbose=False)
+        self.assertEqual([check.url for check in checks], ["/status-code-view/200/"])
+        # Patterns needing arguments are skipped without a provider
+        self.assertEqual(self.assertAllURLsGood(include=["status-code-view"], verbose=False), [])
+
+    def test_view_exception_does_not_stop_sweep(self):
+        with self.assertRaises(AssertionError) as cm:
+            self.assertAllURLsGood(include=["view-bad-reverse", "view-200"], verbose=False)
+        self.assertIn("NoReverseMatch", str(cm.exception))
+
+    def test_workers_inside_transaction(self):
+        with self.assertRaisesRegex(ValueError, "inside a transaction on default"):
+            self.assertAllURLsGood(include=["view-data-1"], workers=2, verbose=False)
+
+    def test_url_names(self):
+        from django.urls import URLResolver, include, path
+        from django.urls.resolvers import RegexPattern
+
+        nested = ([path("b/", view_contains, name="b"), path("c/", view_contains)], "app")
+        resolver = URLResolver(
+            RegexPattern(r"^/"),
+            [
+                path("a/", view_contains, name="a"),
+                path("ns/", include(nested, namespace="ns")),
+                path("a2/", view_contains, name="a"),
+            ],
+        )
+        self.assertEqual(list(url_names(resolver)), ["a", "ns:b"])
+
+
+class TestPlusAllLoginRequired(TestCase):
+    def test_url_names(self):
+        self.assertAllLoginRequired(["view-needs-login", "cbview-needs-login", "/members/"])
+        self.assertAllLoginRequired(["view-needs-login"], method="post")
+
+    def test_reports_every_unprotected_url(self):
+        with self.assertRaises(AssertionError) as cm:
+            self.assertAllLoginRequired(["view-200", "view-needs-login", "view-redirect", "view-bad-reverse"])
+        message = str(cm.exception)
+        self.assertIn("3 of 4 URLs did not redirect to /accounts/login/", message)
+        self.assertRegex(message, r"/view/200/ +200\n")
+        self.assertRegex(message, r"/view/redirect/ +302 /view/200/\n")
+        self.assertIn("NoReverseMatch", message)
+        self.assertNotIn("view-needs-login", message)
+
+    def test_namespace(self):
+        with self.assertRaises(AssertionError) as cm:
+            self.assertAllLoginRequired(namespace="members", args_provider={"members:detail": {"pk": 1}})
+        message = str(cm.exception)
+        self.assertIn("1 of 3 URLs", message)
+        self.assertIn("members:public", message)
+
+        # members:detail needs arguments, so it has to be supplied or excluded
+        with self.assertRaisesRegex(AssertionError, "Cannot reverse members:detail without arguments"):
+            self.assertAllLoginRequired(namespace="members")
+        with self.assertRaises(AssertionError) as cm:
+            self.assertAllLoginRequired(namespace="members", exclude=["members:detail"])
+        self.assertIn("1 of 2 URLs", str(cm.exception))
+
+    def test_checks_something(self):
+        with self.assertRaisesRegex(AssertionError, "No URL names to check in namespace 'membrs'"):
+            self.assertAllLoginRequired(namespace="membrs")
+        with self.assertRaisesRegex(AssertionError, "No URL names to check"):
+            self.assertAllLoginRequired([])
+
+    def test_unreversible_name(self):
+        with self.assertRaisesRegex(AssertionError, "Cannot reverse status-code-view without arguments"):
+            self.assertAllLoginRequired(["view-needs-login", "status-code-view"])
+
+    def test_uses_an_anonymous_client(self):
+        user = self.make_user()
+        self.client.force_login(user)
+        self.assertAllLoginRequired(["view-needs-login"])
+
+    def test_needs_url_names_or_namespace(self):
+        with self.assertRaises(ValueError):
+            self.assertAllLoginRequired()
+        with self.assertRaises(ValueError):
+            self.assertAllLoginRequired(["view-needs-login"], namespace="members")
+
+
+ROLES = {"anonymous": None, "member": [], "admin": ["auth.change_user"]}
+
+
+class TestPlusPermissionMatrix(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = cls.make_user("staff", perms=["auth.change_user"])
+        cls.cache_login(cls.staff)
+
+    def test_matrix(self):
+        statuses = self.assertPermissionMatrix(
+            ROLES,
+            {
+                "view-needs-login": {"anonymous": 302, "member": 200, "admin": 200},
+                "view-needs-perm": {"anonymous": 302, "member": 403, "admin": 200},
+                "/members/": {"member": 200},
+            },
+        )
+        self.assertEqual(statuses["member", "view-needs-perm"], 403)
+        self.assertEqual(len(statuses), 7)
+
+    def test_users_are_made_once(self):
+        User = get_user_model()
+        expected = {"view-needs-perm": {"member": 403, "admin": 200}}
+        self.assertPermissionMatrix(ROLES, expected)
+        count = User.objects.count()
+        self.assertPermissionMatrix(ROLES, expected)
+        self.assertEqual(User.objects.count(), count)
+
+    def test_existing_user(self):
+        # The view's own queries and the cached session check: no user is
+        # made and no session is written
+        with self.assertNumQueriesLessThan(6):
+            self.assertPermissionMatrix({"staff": self.staff}, {"view-needs-perm": {"staff": 200}})
+
+    def test_reports_every_mismatch(self):
+        with self.assertRaises(AssertionError) as cm:
+            self.assertPermissionMatrix(
+                ROLES,
+                {
+                    "view-needs-login": {"anonymous": 200, "member": 200},
+                    "view-needs-perm": {"anonymous": 302, "member": 200, "admin": 200},
+                    "members:detail": {"admin": 200},
+                },
+                args_provider={"members:detail": [1]},
+            )
+        message = str(cm.exception)
+        self.assertIn("3 of 6 requests did not get the expected status code", message)
+        self.assertRegex(message, r"anonymous +view-needs-login +/view/needs-login/ +200 +302\n")
+        self.assertRegex(message, r"member +view-needs-perm +/view/needs-perm/ +200 +403\n")
+        self.assertRegex(message, r"admin +members:detail +/members/1/ +200 +TypeError")
+
+    def test_unknown_role(self):
+        with self.assertRaises(ValueError):
+            self.assertPermissionMatrix(ROLES, {"view-needs-login": {"editor": 200}})
+
+
+class TestPlusMultiDatabaseQueries(TestCase):
+    databases = frozenset({"default", "other"})
+
+    def test_all_databases(self):
+        with self.assertNumQueriesLessThan(4, using="__all__") as context:
+            list(Data.objects.all())
+            list(Data.objects.using("other").all())
+            list(Data.objects.using("other").all())
+        self.assertEqual(len(context), 3)
+        self.assertEqual(
+            {alias: len(capture) for alias, capture in context.captures.items()}, {"default": 1, "other": 2}
+        )
+
+    def test_list_of_aliases(self):
+        with self.assertNumQueriesLessThan(2, using=["other"]):
+            list(Data.objects.all())
+            list(Data.objects.using("other").all())
+
+    def test_per_alias_report(self):
+        with (
+            self.assertRaises(AssertionError) as cm,
+            self.assertNumQueriesLessThan(2, using=["default", "other"], verbose=True),
+        ):
+            list(Data.objects.all())
+            list(Data.objects.using("other").all())
+        message = str(cm.exception)
+        self.assertRegex(
+            message, r"2 queries executed, expected less than 2 \(default: 1 queries in [\d.]+ ms, other: 1"
+        )
+        self.assertIn("[other] SELECT", message)
+
+    def test_iterate_single_alias(self):
+        with self.assertNumQueriesLessThan(2) as context:
+            list(Data.objects.all())
+        self.assertIs(context.connection, connections["default"])
+        self.assertEqual([query["sql"] for query in context], [context[0]["sql"]])
+        self.assertIn("SELECT", context[-1]["sql"])
+
+    def test_assert_good_view_using(self):
+        self.assertGoodView("view-data-1", using="__all__")
+        with self.assertRaisesRegex(AssertionError, r"\(default: 1 queries"):
+            self.assertGoodView("view-data-1", using="__all__", test_query_count=1)
+
+
+class TestPlusCBVMultiDatabaseQueries(CBVTestCase):
+    databases = frozenset({"default", "other"})
+
+    def test_assert_good_view_using(self):
+        self.assertGoodView("view-data-1", using=["default", "other"])
+        with self.assertRaisesRegex(AssertionError, r"\(default: 1 queries"):
+            self.assertGoodView("view-data-1", using=["default", "other"], test_query_count=1)
+
+
+class TestPlusRequestProfile(TestCase):
+    def test_profile(self):
+        response = self.get("view-data-5", profile=True)
+        profile = response.profile
+        self.assertIs(self.last_response, response)
+        self.assertEqual(profile.query_count, 5)
+        self.assertEqual(list(profile.middleware), list(settings.MIDDLEWARE))
+        self.assertGreater(profile.total, 0)
+        self.assertGreaterEqual(profile.total, profile.view + sum(profile.middleware.values()))
+
+    def test_profile_templates(self):
+        profile = self.get("view-contains", profile=True).profile
+        self.assertEqual(profile.template_count, 1)
+        self.assertGreater(profile.template_rendering, 0)
+        self.assertGreaterEqual(profile.view, profile.template_rendering)
+
+    def test_profile_restores_client(self):
+        handler = self.client.handler
+        self.get("view-200", profile=True)
+        self.assertIs(self.client.handler, handler)
+        response = self.get("view-200")
+        self.assertFalse(hasattr(response, "profile"))
+
+    def test_assert_good_view_profile(self):
+        with redirect_stdout(StringIO()) as stdout:
+            self.assertGoodView("view-data-5", profile=True)
+        output = stdout.getvalue()
+        self.assertIn("Request profile:", output)
+        self.assertIn("DB queries (5 queries)", output)
+        self.assertIn("django.contrib.sessions.middleware.SessionMiddleware", output)
+
+
+class TestPlusInstrumentedClient(TestCase):
+    client_class = InstrumentedClient
+
+    def test_every_response_profiled(self):
+        user = self.make_user("u1")
+        with self.login(user):
+            response = self.get("view-needs-login")
+        self.response_200(response)
+        self.assertGreater(response.profile.url_resolution, 0)
+        self.assertGreater(response.profile.query_count, 0)
+
+        response = self.get("view-data-5", profile=True)
+        self.assertEqual(response.profile.query_count, 5)
+
+
+class TestPlusURLSweepWorkers(TransactionTestCase):
+    def test_workers(self):
+        Data.objects.create(name="committed")
+        checks = self.assertAllURLsGood(
+            include=["view-200", "view-json", "view-data-1", "view-data-5"], workers=2, verbose=False
+        )
+        self.assertEqual([check.status for check in checks], [200, 200, 200, 200])
+        self.assertEqual([check.queries for check in checks], [0, 0, 1, 5])
+
+
+class TestPlusTransactionTestCase(TransactionTestCase):
+    def test_helpers(self):
+        user = self.make_user("u1")
+        Data.objects.create(name="committed")
+        self.assertLoginRequired("view-needs-login")
+        with self.login(user):
+            self.get_check_200("view-needs-login")
+
+    def test_written_tables_are_emptied(self):
+        class WritingTests(TransactionTestCase):
+            def test_write(self):
+                self.make_user("u1")
+                Data.objects.create(name="committed")
+
+        assert_tests_pass(self, WritingTests)
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(Data.objects.exists())
+
+    def test_tracks_written_tables(self):
+        self.make_user("u1")
+        Data.objects.create(name="committed")
+        tables = self._tables_to_flush()["default"]
+        self.assertIn(Data._meta.db_table, tables)
+        self.assertIn(User._meta.db_table, tables)
+        # Tables referencing a written table are emptied with it
+        self.assertIn(User.groups.through._meta.db_table, tables)
+        self.assertNotIn("django_content_type", tables)
+
+    def test_seeded_table_falls_back_to_flush(self):
+        from django.contrib.contenttypes.models import ContentType
+
+        ContentType.objects.create(app_label="test_app", model="unused")
+        self.assertIsNone(self._tables_to_flush())
+
+    def test_seeded_table_restored(self):
+        from django.contrib.contenttypes.models import ContentType
+
+        class SeededTableTests(TransactionTestCase):
+            def test_write(self):
+                ContentType.objects.create(app_label="test_app", model="unused")
+
+        assert_tests_pass(self, SeededTableTests)
+        self.assertFalse(ContentType.objects.filter(model="unused").exists())
+        self.assertTrue(ContentType.objects.filter(app_label="auth", model="user").exists())
+
+    def test_proxy_and_unmanaged_models_are_left_out(self):
+        models = _TableState("default").models
+        self.assertIs(models[Data._meta.db_table], Data)
+        self.assertTrue(all(model._meta.managed and not model._meta.proxy for model in models.values()))
+
+
 class TestPlusCBViewTests(CBVTestCase):
     def test_get(self):
         self.get(CBView)
@@ -614,6 +1419,19 @@ class TestPlusCBViewTests(CBVTestCase):
         self.assertLoginRequired("/cbview/needs-login/")
 
 
+class TestPlusCBFormTests(CBVTestCase):
+    def test_get_form(self):
+        with self.assertNumQueriesLessThan(1), self.assertTemplatesRenderedLessThan(1):
+            form = self.get_form(FormErrors, data={})
+        self.assertIsInstance(form, NameForm)
+        self.assertFormErrors(form, field="name", code="required")
+        self.assertFormValid(self.get_form(FormErrors, data={"name": "revsys"}))
+
+    def test_get_form_with_request_template(self):
+        template = self.request_template("post", "/view/form-errors/")
+        self.assertFormValid(self.get_form(FormErrors, request=template.build(data={"name": "revsys"})))
+
+
 class TestPlusCBDataViewTests(CBVTestCase):
     """
     Provide usage examples for CBVTestCase
@@ -709,6 +1527,127 @@ class TestPlusCBDataViewTests(CBVTestCase):
         self.assertTemplateUsed("other.html")  # overridden template
 
 
+class TestPlusCBRequestTemplateTests(CBVTestCase):
+    def setUp(self):
+        self.data = Data.objects.create(name="RevSys")
+
+    def test_request_factory_is_pooled(self):
+        self.assertIs(self.get_request_factory(), CBVTestCase.get_request_factory())
+
+    def test_get_with_template(self):
+        template = self.request_template("get", "/")
+        self.get(CBDataView, request=template, pk=self.data.pk, data={"q": "revsys"})
+        self.response_200()
+        self.assertEqual(self.last_response.context["view"].request.GET["q"], "revsys")
+
+    def test_post_with_template(self):
+        template = self.request_template("post", "/")
+        self.post(CBDataView, request=template, pk=self.data.pk, data={"name": "Changed"})
+        self.response_302()
+        self.data.refresh_from_db()
+        self.assertEqual(self.data.name, "Changed")
+
+        # The template is reusable and unaffected by the previous call
+        self.post(CBDataView, request=template, pk=self.data.pk, data={})
+        self.response_200()
+
+    def test_build_overrides(self):
+        template = self.request_template("get", "/", headers={"X-Base": "1"})
+        user = self.make_user()
+        request = template.build(user=user, headers={"X-Extra": "2"})
+        self.assertIs(request.user, user)
+        self.assertEqual(request.headers["X-Base"], "1")
+        self.assertEqual(request.headers["X-Extra"], "2")
+        self.assertNotIn("X-Extra", template.build().headers)
+
+
+class TestPlusCBVerbTests(CBVTestCase):
+    def test_body_verbs(self):
+        self.assertEqual(self.put(CBVerbView, data="x").content, b"PUTx")
+        self.assertEqual(self.patch(CBVerbView).content, b"PATCH")
+        self.assertEqual(self.delete(CBVerbView).content, b"DELETE")
+
+    def test_head_falls_back_to_get(self):
+        self.head(CBVerbView)
+        self.response_200()
+        self.assertEqual(self.last_response.content, b"HEAD")
+
+    def test_options(self):
+        response = self.options(CBVerbView)
+        self.response_200()
+        self.assertIn("PUT", response["Allow"])
+
+    def test_method_not_allowed(self):
+        self.post(CBVerbView)
+        self.response_405()
+
+    def test_async_view(self):
+        response = self.get(CBAsyncView)
+        self.response_200()
+        self.assertTemplateUsed(response, "test.html")
+        self.assertContext("revsys", 42)
+
+        self.post(CBAsyncView)
+        self.response_201()
+
+    def test_async_options(self):
+        self.options(CBAsyncView)
+        self.response_200()
+
+
+class TestPlusCBMiddlewareTests(CBVTestCase):
+    middleware = (
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+    )
+
+    def test_anonymous_user(self):
+        response = self.get(CBUserView)
+        self.assertEqual(response.content, b"")
+
+    def test_logged_in_user(self):
+        user = self.make_user("mwuser")
+        with self.login(user):
+            response = self.get(CBUserView)
+        self.assertEqual(response.content, b"mwuser")
+
+    def test_chain_is_cached(self):
+        self.assertIs(self.get_middleware_chain(), self.get_middleware_chain())
+
+    def test_middleware_not_in_settings(self):
+        self.middleware = ["django.middleware.gzip.GZipMiddleware"]
+        with self.assertRaises(ImproperlyConfigured):
+            self.get(CBUserView)
+
+    def test_no_middleware_by_default(self):
+        self.middleware = None
+        with self.assertRaises(AttributeError):
+            self.get(CBUserView)
+
+
+@override_settings(
+    MIDDLEWARE=[
+        "test_app.middleware.AsyncOnlyMiddleware",
+        "test_app.middleware.TemplateResponseMiddleware",
+        "django.contrib.sessions.middleware.SessionMiddleware",
+    ]
+)
+class TestPlusCBMiddlewareModeTests(CBVTestCase):
+    def test_async_only_middleware(self):
+        self.middleware = [
+            "test_app.middleware.AsyncOnlyMiddleware",
+            "django.contrib.sessions.middleware.SessionMiddleware",
+        ]
+        response = self.get(CBView)
+        self.response_200(response)
+        self.assertEqual(response["X-Async-Middleware"], "1")
+
+    def test_process_template_response(self):
+        self.middleware = ["test_app.middleware.TemplateResponseMiddleware"]
+        self.get(CBTemplateView)
+        self.assertContext("from_middleware", True)
+
+
 class TestPlusCBTemplateViewTests(CBVTestCase):
     def test_get(self):
         response = self.get(CBTemplateView)
@@ -717,6 +1656,10 @@ class TestPlusCBTemplateViewTests(CBVTestCase):
         self.assertContext("revsys", 42)
         self.assertTemplateUsed(response, template_name="test.html")
 
+    def test_assert_templates_rendered(self):
+        with self.assertTemplatesRenderedLessThan(2), self.assertTemplateRenderTimeLessThan(10):
+            self.get(CBTemplateView)
+
     def test_get_new_template(self):
         template_name = "other.html"
         response = self.get(CBTemplateView, initkwargs={"template_name": template_name})
@@ -778,6 +1721,28 @@ class TestAPITestCaseDRFInstalled(APITestCase):
         self.client.force_authenticate(u1)
 
 
+class TestGetAPIClient(TestCase):
+    def test_memoized(self):
+        self.assertIs(get_api_client(), get_api_client())
+
+    @unittest.skipIf(DRF is True, "DRF is installed.")
+    def test_drf_missing(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_api_client()()
+
+    def test_setting(self):
+        with override_settings(TEST_PLUS_API_CLIENT="django.test.Client"):
+            self.assertIs(get_api_client(), Client)
+        self.assertIsNot(get_api_client(), Client)
+
+
+@override_settings(TEST_PLUS_API_CLIENT="django.test.Client")
+class TestAPITestCaseClientSetting(APITestCase):
+    def test_client_class(self):
+        self.assertIs(type(self.client), Client)
+        self.get_check_200("view-200")
+
+
 # pytest tests
 def test_tp_loads(tp):
     from django.test import Client
@@ -14,6 +14,7 @@ from .views import (
     data_1,
     data_5,
     needs_login,
+    needs_perm,
     status_code_view,
     view_200,
     view_201,
@@ -28,16 +29,26 @@ from .views import (
     view_409,
     view_410,
     view_bad_reverse,
+    view_cached,
     view_contains,
     view_context_with,
     view_context_without,
     view_headers,
+    view_includes,
     view_is_ajax,
     view_json,
     view_redirect,
+    view_redirect_307,
+    view_redirect_chain,
     view_with_messages,
 )
 
+members_patterns = [
+    url(r"^$", needs_login, name="home"),
+    url(r"^(?P<pk>\d+)/$", CBLoginRequiredView.as_view(), name="detail"),
+    url(r"^public/$", view_200, name="public"),
+]
+
 urlpatterns = [
     url(r"^accounts/", include("django.contrib.auth.urls")),
     url(r"^status-code-view/(?P<status>[\d]+)/$", status_code_view, name="status-code-view"),
@@ -56,16 +67,22 @@ urlpatterns = [
     url(r"^view/json/$", view_json, name="view-json"),
     url(r"^view/bad-reverse/$", view_bad_reverse, name="view-bad-reverse"),
     url(r"^view/redirect/$", view_redirect, name="view-redirect"),
+    url(r"^view/redirect-chain/$", view_redirect_chain, name="view-redirect-chain"),
+    url(r"^view/redirect-307/$", view_redirect_307, name="view-redirect-307"),
     url(r"^view/needs-login/$", needs_login, name="view-needs-login"),
+    url(r"^view/needs-perm/$", needs_perm, name="view-needs-perm"),
     url(r"^view/data1/$", data_1, name="view-data-1"),
     url(r"^view/data5/$", data_5, name="view-data-5"),
     url(r"^view/context/with/$", view_context_with, name="view-context-with"),
     url(r"^view/context/without/$", view_context_without, name="view-context-without"),
     url(r"^view/isajax/$", view_is_ajax, name="view-is-ajax"),
     url(r"^view/contains/$", view_contains, name="view-contains"),
+    url(r"^view/includes/$", view_includes, name="view-includes"),
+    url(r"^view/cached/$", view_cached, name="view-cached"),
     url(r"^view/form-errors/$", FormErrors.as_view(), name="form-errors"),
     url(r"^view/headers/$", view_headers, name="view-headers"),
     url(r"^view/with-messages/$", view_with_messages, name="view-with-messages"),
     url(r"^cbview/needs-login/$", CBLoginRequiredView.as_view(), name="cbview-needs-login"),
     url(r"^cbview/$", CBView.as_view(), name="cbview"),
+    url(r"^members/", include((members_patterns, "members"), namespace="members")),
 ]
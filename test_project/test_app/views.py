@@ -1,9 +1,11 @@
 import json
 
 from django.contrib import messages
-from django.contrib.auth.decorators import login_required
+from django.contrib.auth.decorators import login_required, permission_required
+from django.core.cache import cache
 from django.http import HttpResponse, HttpResponseGone
 from django.shortcuts import redirect, render
+from django.template.response import TemplateResponse
 from django.utils.decorators import method_decorator
 from django.views import generic
 
@@ -80,6 +82,16 @@ def view_redirect(request):
     return redirect("view-200")
 
 
+def view_redirect_chain(request):
+    return redirect("/view/redirect/?from=chain", permanent=True)
+
+
+def view_redirect_307(request):
+    response = redirect("view-json")
+    response.status_code = 307
+    return response
+
+
 def view_bad_reverse(request):
     # Deliberately raises NoReverseMatch from *inside* the view
     return HttpResponse(reverse("this-url-name-does-not-exist"))
@@ -101,6 +113,12 @@ def needs_login(request):
     return HttpResponse("", status=200)
 
 
+@login_required
+@permission_required("auth.change_user", raise_exception=True)
+def needs_perm(request):
+    return HttpResponse("", status=200)
+
+
 def data_1(request):
     list(Data.objects.all())
     return HttpResponse("", status=200)
@@ -133,6 +151,18 @@ def view_contains(request):
     return render(request, "test.html", {})
 
 
+def view_cached(request):
+    greeting = cache.get("greeting")
+    if greeting is None:
+        greeting = "Hello world"
+        cache.set("greeting", greeting)
+    return HttpResponse(greeting)
+
+
+def view_includes(request):
+    return render(request, "includes.html", {"items": range(3)})
+
+
 def view_headers(request):
     response = HttpResponse("", content_type="text/plain", status=200)
     response["X-Custom"] = 1
@@ -156,6 +186,33 @@ class CBView(generic.View):
             return False
 
 
+class CBVerbView(generic.View):
+    def get(self, request):
+        return HttpResponse(request.method)
+
+    def put(self, request):
+        return HttpResponse(request.method + request.body.decode())
+
+    def patch(self, request):
+        return HttpResponse(request.method + request.body.decode())
+
+    def delete(self, request):
+        return HttpResponse(request.method)
+
+
+class CBAsyncView(generic.View):
+    async def get(self, request):
+        return TemplateResponse(request, "test.html", {"revsys": 42})
+
+    async def post(self, request):
+        return HttpResponse("", status=201)
+
+
+class CBUserView(generic.View):
+    def get(self, request):
+        return HttpResponse(request.user.get_username())
+
+
 class CBLoginRequiredView(generic.View):
     @method_decorator(login_required)
     def dispatch(self, *args, **kwargs):